@@ -1,9 +1,11 @@
 """
 Configuration for allowlisted web domains
 """
+from functools import lru_cache
+from urllib.parse import urlparse
 
 # Allowlisted domains for external API access
-ALLOWED_DOMAINS = [
+ALLOWED_DOMAINS = frozenset([
     # CoinGecko
     'api.coingecko.com',
     'pro-api.coingecko.com',
@@ -24,13 +26,15 @@ ALLOWED_DOMAINS = [
     # WebSocket endpoints
     'stream.binance.com',
     'ws-feed.exchange.coinbase.com',
-]
+])
 
+@lru_cache(maxsize=1024)
 def is_domain_allowed(url: str) -> bool:
     """Check if a URL's domain is in the allowlist"""
-    from urllib.parse import urlparse
-    
     parsed = urlparse(url)
-    domain = parsed.netloc
+    # hostname drops any port/userinfo and lowercases
+    domain = parsed.hostname or ''
+    if domain.startswith('www.'):
+        domain = domain[4:]
     
     return domain in ALLOWED_DOMAINS
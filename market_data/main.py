@@ -2,47 +2,182 @@
 Market Data Service - Collects market data from Binance WebSocket and stores to Parquet/SQLite
 """
 import asyncio
-import websockets
-import json
-import pandas as pd
+import atexit
+import aiohttp
+import msgpack
+import orjson
+import queue
+import signal
 import sqlite3
+import sys
+import threading
+import time
+import uuid
 from datetime import datetime
 import os
 from pathlib import Path
-from typing import Dict, List
+from typing import Awaitable, Callable, Dict, List, Union
+import numpy as np
 import pyarrow as pa
+import pyarrow.compute as pc
 import pyarrow.parquet as pq
 
+# Prepared INSERT statements, one per table; rows are bound as tuples via executemany
+_DEPTH_SQL = """
+    INSERT OR REPLACE INTO depth (timestamp, symbol, bids, asks)
+    VALUES (?, ?, ?, ?)
+"""
+
+_TRADES_SQL = """
+    INSERT INTO trades (timestamp, symbol, price, quantity, is_buyer_maker)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+_KLINES_SQL = """
+    INSERT OR REPLACE INTO klines
+    (timestamp, symbol, interval, open, high, low, close, volume)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+BINANCE_COMBINED_URL = "wss://stream.binance.com:9443/stream?streams="
+KLINE_INTERVALS = ("1m", "5m")
+
+# Trades are buffered column-wise (SoA); order matches _TRADES_SQL
+TRADE_COLUMNS = ('timestamp', 'symbol', 'price', 'quantity', 'is_buyer_maker')
+
 class BinanceWebSocketClient:
     """WebSocket client for Binance market data"""
     
     def __init__(self, symbols: List[str], db_path: str, parquet_dir: str):
-        self.symbols = symbols
+        # Interned so every buffered row shares one string object per symbol
+        self.symbols = [sys.intern(s) for s in symbols]
+        self._routes = self.stream_routes()
         self.db_path = db_path
         self.parquet_dir = Path(parquet_dir)
         self.parquet_dir.mkdir(parents=True, exist_ok=True)
         
+        # Persistent connection; transactions are managed explicitly in save_to_sqlite
+        self._writer_conn = sqlite3.connect(db_path, isolation_level=None, check_same_thread=False)
+        self._writer_conn.execute("PRAGMA journal_mode=WAL")
+        self._writer_conn.execute("PRAGMA synchronous=NORMAL")
+        self._writer_conn.execute("PRAGMA cache_size=-65536")
+        self._writer_conn.execute("PRAGMA temp_store=MEMORY")
+        # Memory-mapped reads of hot pages; keep dirty pages in cache until COMMIT
+        self._writer_conn.execute("PRAGMA mmap_size=268435456")
+        self._writer_conn.execute("PRAGMA cache_spill=0")
+        
         # Initialize database
         self.init_database()
         
         # Data buffers
         self.depth_buffer = []
-        self.trades_buffer = []
         self.klines_buffer = []
         self.buffer_size = 100
+        self._reset_trade_columns()
         
+        # Buffers flush when full or when their oldest data is older than flush_interval seconds
+        self.flush_interval = 1.0
+        self._last_flush = {'depth': 0.0, 'trades': 0.0, 'klines': 0.0}
+        
+        # Full buffers are handed to a writer thread so disk I/O never blocks the event loop
+        self._write_q: queue.Queue = queue.Queue(maxsize=1024)
+        self._writer = threading.Thread(target=self._writer_loop, name="market-data-writer", daemon=True)
+        self._writer.start()
+        atexit.register(self.close)
+        
+    def close(self):
+        """Flush buffers, drain pending writes and close the SQLite connection"""
+        if self._writer_conn is None:
+            return
+        for table in self._last_flush:
+            self._flush(table)
+        self._write_q.put(None)
+        self._writer.join()
+        self._writer_conn.close()
+        self._writer_conn = None
+    
+    def _writer_loop(self):
+        """Persist queued batches until the shutdown sentinel arrives"""
+        while True:
+            item = self._write_q.get()
+            if item is None:
+                return
+            table, data = item
+            try:
+                self.save_to_sqlite(table, data)
+                self.save_to_parquet(table, data)
+            except Exception as e:
+                print(f"Error writing {table} batch: {e}")
+    
+    def _reset_trade_columns(self):
+        """Allocate fresh trade column arrays; flushed arrays are owned by the writer"""
+        n = self.buffer_size
+        self.trades_cols = {
+            'timestamp': np.empty(n, dtype='i8'),
+            'symbol': [None] * n,
+            'price': np.empty(n, dtype='f8'),
+            'quantity': np.empty(n, dtype='f8'),
+            'is_buyer_maker': np.empty(n, dtype='u1'),
+        }
+        self.trades_n = 0
+    
+    def _trades_table(self) -> pa.Table:
+        """Wrap the filled part of the trade columns in an Arrow table"""
+        n = self.trades_n
+        cols = self.trades_cols
+        return pa.Table.from_arrays(
+            [pa.array(cols[name][:n]) for name in TRADE_COLUMNS],
+            names=list(TRADE_COLUMNS),
+        )
+    
+    def _flush(self, table: str):
+        """Hand the table's buffered rows to the writer thread"""
+        if table == 'trades':
+            if self.trades_n:
+                self._enqueue('trades', self._trades_table())
+                self._reset_trade_columns()
+        elif table == 'depth':
+            if self.depth_buffer:
+                self._enqueue('depth', self.depth_buffer)
+                self.depth_buffer = []
+        elif table == 'klines':
+            if self.klines_buffer:
+                self._enqueue('klines', self.klines_buffer)
+                self.klines_buffer = []
+        self._last_flush[table] = time.monotonic()
+    
+    async def _flush_timer(self):
+        """Time trigger: flush quiet buffers so rows never sit in memory for long"""
+        while True:
+            await asyncio.sleep(0.5)
+            now = time.monotonic()
+            for table, last in self._last_flush.items():
+                if now - last >= self.flush_interval:
+                    self._flush(table)
+    
+    def _enqueue(self, table: str, data: Union[List[Dict], pa.Table]):
+        """Queue a batch for the writer thread, dropping the oldest batch when full"""
+        try:
+            self._write_q.put_nowait((table, data))
+        except queue.Full:
+            try:
+                old_table, old_data = self._write_q.get_nowait()
+                print(f"Write queue full, dropped {len(old_data)} {old_table} rows")
+            except queue.Empty:
+                pass
+            self._write_q.put_nowait((table, data))
+    
     def init_database(self):
         """Initialize SQLite database with tables"""
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        cursor = self._writer_conn.cursor()
         
         # Depth table
         cursor.execute("""
             CREATE TABLE IF NOT EXISTS depth (
                 timestamp INTEGER,
                 symbol TEXT,
-                bids TEXT,
-                asks TEXT,
+                bids BLOB,
+                asks BLOB,
                 PRIMARY KEY (timestamp, symbol)
             )
         """)
@@ -77,76 +212,72 @@ class BinanceWebSocketClient:
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_trades_symbol ON trades(symbol)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_trades_timestamp ON trades(timestamp)")
         cursor.execute("CREATE INDEX IF NOT EXISTS idx_klines_symbol ON klines(symbol)")
-        
-        conn.commit()
-        conn.close()
     
-    def save_to_sqlite(self, table: str, data: List[Dict]):
-        """Save data to SQLite"""
-        if not data:
+    def save_to_sqlite(self, table: str, data: Union[List[Dict], pa.Table]):
+        """Save data to SQLite in a single transaction"""
+        if not len(data):
             return
         
-        conn = sqlite3.connect(self.db_path)
-        cursor = conn.cursor()
+        if table == 'depth':
+            sql = _DEPTH_SQL
+            rows = [(item['timestamp'], item['symbol'],
+                     msgpack.packb(item['bids'], use_bin_type=True),
+                     msgpack.packb(item['asks'], use_bin_type=True)) for item in data]
+        elif table == 'trades' and isinstance(data, pa.Table):
+            sql = _TRADES_SQL
+            rows = list(zip(*(data.column(name).to_pylist() for name in TRADE_COLUMNS)))
+        elif table == 'trades':
+            sql = _TRADES_SQL
+            rows = [(item['timestamp'], item['symbol'], item['price'],
+                     item['quantity'], item['is_buyer_maker']) for item in data]
+        elif table == 'klines':
+            sql = _KLINES_SQL
+            rows = [(item['timestamp'], item['symbol'], item['interval'],
+                     item['open'], item['high'], item['low'],
+                     item['close'], item['volume']) for item in data]
+        else:
+            return
         
+        self._writer_conn.execute("BEGIN IMMEDIATE")
         try:
-            if table == 'depth':
-                for item in data:
-                    cursor.execute("""
-                        INSERT OR REPLACE INTO depth (timestamp, symbol, bids, asks)
-                        VALUES (?, ?, ?, ?)
-                    """, (item['timestamp'], item['symbol'], 
-                          json.dumps(item['bids']), json.dumps(item['asks'])))
-            
-            elif table == 'trades':
-                for item in data:
-                    cursor.execute("""
-                        INSERT INTO trades (timestamp, symbol, price, quantity, is_buyer_maker)
-                        VALUES (?, ?, ?, ?, ?)
-                    """, (item['timestamp'], item['symbol'], item['price'], 
-                          item['quantity'], item['is_buyer_maker']))
-            
-            elif table == 'klines':
-                for item in data:
-                    cursor.execute("""
-                        INSERT OR REPLACE INTO klines 
-                        (timestamp, symbol, interval, open, high, low, close, volume)
-                        VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                    """, (item['timestamp'], item['symbol'], item['interval'],
-                          item['open'], item['high'], item['low'], 
-                          item['close'], item['volume']))
-            
-            conn.commit()
-        finally:
-            conn.close()
+            self._writer_conn.executemany(sql, rows)
+        except Exception:
+            self._writer_conn.execute("ROLLBACK")
+            raise
+        self._writer_conn.execute("COMMIT")
     
-    def save_to_parquet(self, table: str, data: List[Dict]):
-        """Save data to Parquet files"""
-        if not data:
+    def save_to_parquet(self, table: str, data: Union[List[Dict], pa.Table]):
+        """Append data to the table's Parquet dataset, partitioned by date"""
+        if not len(data):
             return
         
-        df = pd.DataFrame(data)
+        arrow_table = data if isinstance(data, pa.Table) else pa.Table.from_pylist(data)
         
-        # Partition by date
-        df['date'] = pd.to_datetime(df['timestamp'], unit='ms').dt.date
+        # Partition by date; each flush writes its own file so existing data is never rewritten
+        dates = pc.cast(pc.cast(arrow_table['timestamp'], pa.timestamp('ms')), pa.date32())
+        bounds = pc.min_max(dates)
+        basename = f"part-{uuid.uuid4().hex}"
         
-        for date, group in df.groupby('date'):
-            parquet_file = self.parquet_dir / table / f"{date}.parquet"
-            parquet_file.parent.mkdir(parents=True, exist_ok=True)
-            
-            # Append or create
-            if parquet_file.exists():
-                existing_df = pd.read_parquet(parquet_file)
-                combined_df = pd.concat([existing_df, group], ignore_index=True)
-                combined_df.to_parquet(parquet_file, index=False)
-            else:
-                group.to_parquet(parquet_file, index=False)
+        if bounds['min'] == bounds['max']:
+            # Common case: the whole batch is one day, write it straight into that partition
+            part_dir = self.parquet_dir / table / f"date={bounds['min'].as_py().isoformat()}"
+            part_dir.mkdir(parents=True, exist_ok=True)
+            pq.write_table(arrow_table, part_dir / f"{basename}-0.parquet")
+            return
+        
+        pq.write_to_dataset(
+            arrow_table.append_column('date', dates),
+            root_path=str(self.parquet_dir / table),
+            partition_cols=['date'],
+            existing_data_behavior='overwrite_or_ignore',
+            basename_template=f"{basename}-{{i}}.parquet",
+        )
     
     async def handle_depth(self, msg: Dict):
         """Handle depth/orderbook updates"""
         data = {
             'timestamp': msg['E'],
-            'symbol': msg['s'],
+            'symbol': sys.intern(msg['s']),
             'bids': msg['b'][:10],  # Top 10 bids
             'asks': msg['a'][:10],  # Top 10 asks
         }
@@ -154,26 +285,21 @@ class BinanceWebSocketClient:
         self.depth_buffer.append(data)
         
         if len(self.depth_buffer) >= self.buffer_size:
-            self.save_to_sqlite('depth', self.depth_buffer)
-            self.save_to_parquet('depth', self.depth_buffer)
-            self.depth_buffer = []
+            self._flush('depth')
     
     async def handle_trade(self, msg: Dict):
         """Handle trade updates"""
-        data = {
-            'timestamp': msg['T'],
-            'symbol': msg['s'],
-            'price': float(msg['p']),
-            'quantity': float(msg['q']),
-            'is_buyer_maker': int(msg['m'])
-        }
-        
-        self.trades_buffer.append(data)
+        i = self.trades_n
+        cols = self.trades_cols
+        cols['timestamp'][i] = msg['T']
+        cols['symbol'][i] = sys.intern(msg['s'])
+        cols['price'][i] = float(msg['p'])
+        cols['quantity'][i] = float(msg['q'])
+        cols['is_buyer_maker'][i] = msg['m']
+        self.trades_n = i + 1
         
-        if len(self.trades_buffer) >= self.buffer_size:
-            self.save_to_sqlite('trades', self.trades_buffer)
-            self.save_to_parquet('trades', self.trades_buffer)
-            self.trades_buffer = []
+        if self.trades_n >= self.buffer_size:
+            self._flush('trades')
     
     async def handle_kline(self, msg: Dict):
         """Handle kline/candlestick updates"""
@@ -181,7 +307,7 @@ class BinanceWebSocketClient:
         if k['x']:  # Only process closed candles
             data = {
                 'timestamp': k['t'],
-                'symbol': msg['s'],
+                'symbol': sys.intern(msg['s']),
                 'interval': k['i'],
                 'open': float(k['o']),
                 'high': float(k['h']),
@@ -193,54 +319,54 @@ class BinanceWebSocketClient:
             self.klines_buffer.append(data)
             
             if len(self.klines_buffer) >= self.buffer_size:
-                self.save_to_sqlite('klines', self.klines_buffer)
-                self.save_to_parquet('klines', self.klines_buffer)
-                self.klines_buffer = []
+                self._flush('klines')
     
-    async def subscribe_depth(self, symbol: str):
-        """Subscribe to depth updates for a symbol"""
-        stream = f"{symbol.lower()}@depth20@100ms"
-        url = f"wss://stream.binance.com:9443/ws/{stream}"
-        
-        async with websockets.connect(url) as ws:
-            print(f"Connected to depth stream for {symbol}")
-            async for message in ws:
-                msg = json.loads(message)
-                await self.handle_depth(msg)
+    def stream_names(self) -> List[str]:
+        """Combined-stream names for every symbol and channel"""
+        return list(self.stream_routes())
     
-    async def subscribe_trades(self, symbol: str):
-        """Subscribe to trade updates for a symbol"""
-        stream = f"{symbol.lower()}@trade"
-        url = f"wss://stream.binance.com:9443/ws/{stream}"
-        
-        async with websockets.connect(url) as ws:
-            print(f"Connected to trades stream for {symbol}")
-            async for message in ws:
-                msg = json.loads(message)
-                await self.handle_trade(msg)
+    def stream_routes(self) -> Dict[str, Callable[[Dict], Awaitable[None]]]:
+        """Map each combined-stream name to its handler"""
+        routes = {}
+        for symbol in self.symbols:
+            s = symbol.lower()
+            routes[f"{s}@depth20@100ms"] = self.handle_depth
+            routes[f"{s}@trade"] = self.handle_trade
+            for interval in KLINE_INTERVALS:
+                routes[f"{s}@kline_{interval}"] = self.handle_kline
+        return routes
     
-    async def subscribe_klines(self, symbol: str, interval: str = "1m"):
-        """Subscribe to kline updates for a symbol"""
-        stream = f"{symbol.lower()}@kline_{interval}"
-        url = f"wss://stream.binance.com:9443/ws/{stream}"
-        
-        async with websockets.connect(url) as ws:
-            print(f"Connected to klines stream for {symbol} ({interval})")
-            async for message in ws:
-                msg = json.loads(message)
-                await self.handle_kline(msg)
+    async def dispatch(self, stream: str, msg: Dict):
+        """Route a combined-stream payload to its handler"""
+        handler = self._routes.get(stream)
+        if handler is not None:
+            await handler(msg)
     
     async def run(self):
-        """Run all WebSocket subscriptions"""
-        tasks = []
+        """Run all subscriptions over a single combined WebSocket stream"""
+        url = BINANCE_COMBINED_URL + "/".join(self.stream_names())
         
-        for symbol in self.symbols:
-            tasks.append(asyncio.create_task(self.subscribe_depth(symbol)))
-            tasks.append(asyncio.create_task(self.subscribe_trades(symbol)))
-            tasks.append(asyncio.create_task(self.subscribe_klines(symbol, "1m")))
-            tasks.append(asyncio.create_task(self.subscribe_klines(symbol, "5m")))
+        flush_timer = asyncio.create_task(self._flush_timer())
         
-        await asyncio.gather(*tasks)
+        # aiohttp parses frames and inflates permessage-deflate in C. receive() only suspends
+        # when its frame queue is empty, and the handlers never suspend, so a burst of queued
+        # frames is drained back to back into the buffers before control returns to the loop.
+        try:
+            async with aiohttp.ClientSession() as session:
+                async with session.ws_connect(url, compress=15, heartbeat=30, max_msg_size=2**20) as ws:
+                    print(f"Connected to combined stream for {', '.join(self.symbols)}")
+                    TEXT = aiohttp.WSMsgType.TEXT
+                    while True:
+                        message = await ws.receive()
+                        if message.type != TEXT:
+                            if message.type in (aiohttp.WSMsgType.CLOSE, aiohttp.WSMsgType.CLOSING,
+                                                aiohttp.WSMsgType.CLOSED, aiohttp.WSMsgType.ERROR):
+                                break
+                            continue
+                        envelope = orjson.loads(message.data)
+                        await self.dispatch(envelope['stream'], envelope['data'])
+        finally:
+            flush_timer.cancel()
 
 async def main():
     """Main entry point"""
@@ -255,13 +381,27 @@ async def main():
     # Create client and run
     client = BinanceWebSocketClient(symbols, db_path, parquet_dir)
     
+    # atexit does not run on SIGTERM (docker stop); cancel instead so finally closes the writer
+    try:
+        asyncio.get_running_loop().add_signal_handler(signal.SIGTERM, asyncio.current_task().cancel)
+    except NotImplementedError:
+        pass
+    
     try:
         await client.run()
-    except KeyboardInterrupt:
+    except (KeyboardInterrupt, asyncio.CancelledError):
         print("Shutting down...")
     except Exception as e:
         print(f"Error: {e}")
         raise
+    finally:
+        client.close()
 
 if __name__ == "__main__":
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        if sys.platform == "win32":
+            asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
     asyncio.run(main())
@@ -1,28 +1,40 @@
 from __future__ import annotations
 import os
+from functools import lru_cache
 import yaml
 from typing import Any, Dict
 
+try:
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # libyaml not available
+    from yaml import SafeLoader as _SafeLoader
+
 BASE_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "..", "..", ".."))
 CONFIG_DIR = os.path.join(BASE_DIR, "configs")
 
 
 def _read_yaml(path: str) -> Dict[str, Any]:
     with open(path, "r", encoding="utf-8") as f:
-        return yaml.safe_load(f) or {}
+        return yaml.load(f, Loader=_SafeLoader) or {}
+
 
+# Config files are read once per process; the returned dicts are shared, treat them as read-only.
 
+@lru_cache(maxsize=1)
 def load_app_config() -> Dict[str, Any]:
     return _read_yaml(os.path.join(CONFIG_DIR, "app.yaml"))
 
 
+@lru_cache(maxsize=1)
 def load_exchanges_config() -> Dict[str, Any]:
     return _read_yaml(os.path.join(CONFIG_DIR, "exchanges.yaml"))
 
 
+@lru_cache(maxsize=1)
 def load_risk_config() -> Dict[str, Any]:
     return _read_yaml(os.path.join(CONFIG_DIR, "risk.yaml"))
 
 
+@lru_cache(maxsize=1)
 def load_logging_config() -> Dict[str, Any]:
     return _read_yaml(os.path.join(CONFIG_DIR, "logging.yaml"))
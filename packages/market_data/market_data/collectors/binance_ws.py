@@ -1,27 +1,42 @@
 from __future__ import annotations
 import asyncio
 import json
+import msgspec
 import websockets
 from typing import List
 from ..store.parquet_writer import write_events
 
 STREAM = "wss://stream.binance.com:9443/ws"
 
+
+class TradeMsg(msgspec.Struct, frozen=True, gc=False):
+    """Raw Binance trade frame; decoded straight from JSON without an intermediate dict."""
+    e: str = ""
+    s: str = ""
+    T: int = 0
+    p: float = 0.0
+    q: float = 0.0
+
+
+# strict=False lets the string-encoded price/qty decode into floats
+_decoder = msgspec.json.Decoder(TradeMsg, strict=False)
+
+
 async def collect_trades(symbols: List[str]):
     subs = [{"method":"SUBSCRIBE","params":[f"{sym}@trade" for sym in symbols],"id":1}]
-    async with websockets.connect(STREAM) as ws:
+    async with websockets.connect(STREAM, max_size=2**20, max_queue=64) as ws:
         await ws.send(json.dumps(subs[0]))
         batch = []
         while True:
-            msg = await ws.recv()
-            data = json.loads(msg)
-            if 'e' in data and data.get('e') == 'trade':
+            msg = await ws.recv(decode=False)  # raw frame bytes go straight to the JSON decoder
+            data = _decoder.decode(msg)
+            if data.e == 'trade':
                 batch.append({
                     'venue': 'binance',
-                    'symbol': data.get('s'),
-                    'ts': int(data.get('T',0)),
-                    'price': float(data.get('p',0.0)),
-                    'size': float(data.get('q',0.0)),
+                    'symbol': data.s,
+                    'ts': data.T,
+                    'price': data.p,
+                    'size': data.q,
                 })
             if len(batch) >= 100:
                 write_events('binance_trades', batch)
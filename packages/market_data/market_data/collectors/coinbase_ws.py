@@ -1,5 +1,6 @@
 from __future__ import annotations
 import json
+import orjson
 from typing import List
 import websockets
 from ..store.parquet_writer import write_events
@@ -13,12 +14,12 @@ async def collect_trades(products: List[str]):
         "product_ids": products,
         "channel": "market_trades"
     }
-    async with websockets.connect(STREAM) as ws:
+    async with websockets.connect(STREAM, max_size=2**20, max_queue=64) as ws:
         await ws.send(json.dumps(sub))
         batch = []
         while True:
-            msg = await ws.recv()
-            data = json.loads(msg)
+            msg = await ws.recv(decode=False)  # raw frame bytes go straight to the JSON decoder
+            data = orjson.loads(msg)
             if isinstance(data, dict) and data.get('type') == 'message':
                 events = data.get('events') or []
                 for ev in events:
@@ -1,10 +1,37 @@
 from __future__ import annotations
 import asyncio
+import signal
+import sys
+
+from .store import parquet_writer
 
 async def run_collectors():
     # TODO: wire Binance/Coinbase WS and write to store
     while True:
         await asyncio.sleep(1)
+        parquet_writer.flush_due()
+
+async def main():
+    # atexit does not run on SIGTERM (docker stop); cancel instead so finally closes the writers
+    loop = asyncio.get_running_loop()
+    task = asyncio.current_task()
+    for sig in (signal.SIGTERM, signal.SIGINT):
+        try:
+            loop.add_signal_handler(sig, task.cancel)
+        except NotImplementedError:
+            pass
+    try:
+        await run_collectors()
+    except asyncio.CancelledError:
+        pass
+    finally:
+        parquet_writer.close()
 
 if __name__ == "__main__":
-    asyncio.run(run_collectors())
+    try:
+        import uvloop
+        uvloop.install()
+    except ImportError:
+        if sys.platform == "win32":
+            asyncio.set_event_loop_policy(asyncio.WindowsSelectorEventLoopPolicy())
+    asyncio.run(main())
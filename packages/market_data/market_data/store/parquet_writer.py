@@ -1,13 +1,143 @@
 from __future__ import annotations
+import atexit
 import os
-from typing import Iterable, Dict, Any
+import time
+import uuid
+from datetime import date, timedelta
+from typing import Iterable, Dict, Any, List, Optional, Tuple
 import pyarrow as pa
 import pyarrow.parquet as pq
 
 DATA_DIR = os.path.abspath(os.path.join(os.path.dirname(__file__), "../../../..", "data", "parquet"))
 
+# Collectors hand over ~100-row batches; accumulate them so each file gets large row groups.
+ROW_GROUP_SIZE = 65536
+FLUSH_INTERVAL_S = 30.0
+# A file only gets its footer on close, so writers are rotated to a new part file on this
+# schedule; a hard kill then loses at most one open part instead of the whole day.
+ROTATE_INTERVAL_S = 300.0
+
+MS_PER_DAY = 86_400_000
+
+TRADE_SCHEMA = pa.schema([
+    ("venue", pa.string()),
+    ("symbol", pa.dictionary(pa.int16(), pa.string())),
+    ("ts", pa.int64()),
+    ("price", pa.float64()),
+    ("size", pa.float64()),
+])
+
+SCHEMAS: Dict[str, pa.Schema] = {
+    "binance_trades": TRADE_SCHEMA,
+    "coinbase_trades": TRADE_SCHEMA,
+}
+
+# Pending batches and open writers are keyed by (dataset, days since epoch of 'ts')
+_Key = Tuple[str, int]
+_pending: Dict[_Key, List[pa.RecordBatch]] = {}
+_pending_rows: Dict[_Key, int] = {}
+_last_flush: Dict[_Key, float] = {}
+_writers: Dict[_Key, pq.ParquetWriter] = {}
+_opened: Dict[_Key, float] = {}
+
+
+def _schema_for(dataset: str, rows: List[Dict[str, Any]]) -> pa.Schema:
+    schema = SCHEMAS.get(dataset)
+    if schema is None:
+        # unknown dataset: infer once from the first batch and reuse it
+        schema = SCHEMAS[dataset] = pa.Table.from_pylist(rows).schema
+    return schema
+
 
 def write_events(dataset: str, rows: Iterable[Dict[str, Any]]) -> None:
-    os.makedirs(DATA_DIR, exist_ok=True)
-    table = pa.Table.from_pylist(list(rows))
-    pq.write_to_dataset(table, root_path=os.path.join(DATA_DIR, dataset))
+    rows = list(rows)
+    if not rows:
+        return
+    schema = _schema_for(dataset, rows)
+    names = schema.names
+
+    # one pass from row dicts to per-day column lists
+    by_day: Dict[int, Dict[str, list]] = {}
+    for r in rows:
+        day = int(r.get("ts") or 0) // MS_PER_DAY
+        cols = by_day.get(day)
+        if cols is None:
+            cols = by_day[day] = {name: [] for name in names}
+        for name in names:
+            cols[name].append(r.get(name))
+
+    now = time.monotonic()
+    for day, cols in by_day.items():
+        key = (dataset, day)
+        batch = pa.RecordBatch.from_pydict(cols, schema=schema)
+        _pending.setdefault(key, []).append(batch)
+        _pending_rows[key] = _pending_rows.get(key, 0) + batch.num_rows
+        last = _last_flush.setdefault(key, now)
+        # quiet datasets are picked up by flush_due()
+        if _pending_rows[key] >= ROW_GROUP_SIZE or now - last >= FLUSH_INTERVAL_S:
+            _flush_key(key)
+
+
+def _open_writer(key: _Key, schema: pa.Schema) -> pq.ParquetWriter:
+    dataset, day = key
+    # a new day for this dataset finalizes the files of earlier days
+    for old in [k for k in _writers if k[0] == dataset and k[1] < day]:
+        _close_writer(old)
+    day_str = (date(1970, 1, 1) + timedelta(days=day)).isoformat()
+    out_dir = os.path.join(DATA_DIR, dataset, f"date={day_str}")
+    os.makedirs(out_dir, exist_ok=True)
+    writer = pq.ParquetWriter(
+        os.path.join(out_dir, f"part-{uuid.uuid4().hex}.parquet"),
+        schema,
+        compression="lz4",
+        use_dictionary=True,
+        data_page_size=1 << 20,
+    )
+    _writers[key] = writer
+    _opened[key] = time.monotonic()
+    return writer
+
+
+def _close_writer(key: _Key) -> None:
+    _opened.pop(key, None)
+    _writers.pop(key).close()
+
+
+def _flush_key(key: _Key) -> None:
+    batches = _pending.pop(key, None)
+    _pending_rows.pop(key, None)
+    _last_flush[key] = time.monotonic()
+    if not batches:
+        return
+    writer = _writers.get(key) or _open_writer(key, batches[0].schema)
+    writer.write_table(pa.Table.from_batches(batches), row_group_size=ROW_GROUP_SIZE)
+    if time.monotonic() - _opened[key] >= ROTATE_INTERVAL_S:
+        _close_writer(key)
+
+
+def flush(dataset: Optional[str] = None) -> None:
+    for key in [k for k in _pending if dataset is None or k[0] == dataset]:
+        _flush_key(key)
+
+
+def flush_due() -> None:
+    """Flush batches older than FLUSH_INTERVAL_S and rotate writers older than ROTATE_INTERVAL_S.
+
+    write_events() only checks the timers when a batch arrives; call this periodically so a
+    quiet dataset does not hold rows or an open file indefinitely.
+    """
+    now = time.monotonic()
+    for key in [k for k in _pending if now - _last_flush.get(k, now) >= FLUSH_INTERVAL_S]:
+        _flush_key(key)
+    for key in [k for k, t in _opened.items() if now - t >= ROTATE_INTERVAL_S]:
+        _close_writer(key)
+
+
+def close() -> None:
+    """Flush pending rows and finalize all open files (footers are written on close)."""
+    flush()
+    for key in list(_writers):
+        _close_writer(key)
+
+
+atexit.register(close)
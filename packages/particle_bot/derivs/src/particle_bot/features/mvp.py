@@ -1,31 +1,48 @@
 from __future__ import annotations
-from dataclasses import dataclass
-from typing import Dict, Any, DefaultDict
+from bisect import bisect_left, bisect_right, insort
+from dataclasses import dataclass, field
+from typing import Callable, Dict, Any, DefaultDict
 from collections import defaultdict
+import math
 import numpy as np
 
 from particle_bot.types import BaseEvent, TradePrint, BookDelta, FundingTick, OITick, BasisTick, EventType, TradeSide, Symbol
 from particle_bot.scales import Scale, DEFAULT_SCALES
-from particle_bot.utils.ringbuffer import RingBuffer
-from particle_bot.utils.stats import mean, stdev, zscore, clamp
+from particle_bot.utils.ringbuffer import RingBuffer, NumericRingBuffer
+from particle_bot.utils.stats import zscore, clamp
+from particle_bot.utils.kernels import autocorr1, cumsum_slope, tail_frac
+
+
+TRADE_BATCH = 256
+# vol_percentile history: std of the last VOL_WIN rets, sampled every VOL_STEP rets
+VOL_WIN = 200
+VOL_STEP = 50
+_SIDE_SIGN = {TradeSide.BUY: 1.0, TradeSide.SELL: -1.0}
 
 
 @dataclass
 class ScaleState:
-    prices: RingBuffer[float]
-    rets: RingBuffer[float]
-    sizes: RingBuffer[float]
-    signed_sizes: RingBuffer[float]
+    prices: RingBuffer
+    rets: NumericRingBuffer
+    sizes: NumericRingBuffer
+    signed_sizes: RingBuffer
+    # rolling-std samples covering roughly the rets window
+    vol_hist: RingBuffer
     # for simple linear slopes (use np.polyfit on snapshots)
     cvd: float = 0.0
     last_price: float | None = None
+    n_rets: int = 0
 
 
 @dataclass
 class DerivState:
-    funding_hist: RingBuffer[float]
-    oi_hist: RingBuffer[float]
-    basis_hist: RingBuffer[float]
+    funding_hist: NumericRingBuffer
+    oi_hist: NumericRingBuffer
+    basis_hist: NumericRingBuffer
+    # basis_hist contents kept in sorted order, for the percentile lookup
+    basis_sorted: list[float] = field(default_factory=list)
+    # rank of the latest basis in basis_hist; only moves on basis ticks
+    basis_percentile: float = 0.5
     funding: float = 0.0
     oi: float = 0.0
     basis: float = 0.0
@@ -39,6 +56,14 @@ class MVPFeatureEngine:
         self.derivs: Dict[Symbol, DerivState] = {}
         self.last_book: Dict[Symbol, Dict[str, Any]] = {}
         self.trade_count: DefaultDict[Symbol, int] = defaultdict(int)
+        self._pending_trades: DefaultDict[Symbol, list[tuple[float, float, float]]] = defaultdict(list)
+        self._dispatch: Dict[EventType, Callable[[Any], None]] = {
+            EventType.TRADE_PRINT: self._update_trade,
+            EventType.BOOK_DELTA: self._update_book,
+            EventType.FUNDING_TICK: self._update_funding,
+            EventType.OI_TICK: self._update_oi,
+            EventType.BASIS_TICK: self._update_basis,
+        }
 
     def _get_scale_state(self, symbol: Symbol, scale: Scale) -> ScaleState:
         key = (symbol, scale.name)
@@ -46,59 +71,79 @@ class MVPFeatureEngine:
             n = scale.trade_count or 2000
             self.scale_states[key] = ScaleState(
                 prices=RingBuffer(maxlen=n),
-                rets=RingBuffer(maxlen=n),
-                sizes=RingBuffer(maxlen=n),
+                rets=NumericRingBuffer(maxlen=n),
+                sizes=NumericRingBuffer(maxlen=n),
                 signed_sizes=RingBuffer(maxlen=n),
+                vol_hist=RingBuffer(maxlen=max(1, (n - VOL_WIN + VOL_STEP - 1) // VOL_STEP)),
             )
         return self.scale_states[key]
 
     def _get_deriv_state(self, symbol: Symbol) -> DerivState:
         if symbol not in self.derivs:
             self.derivs[symbol] = DerivState(
-                funding_hist=RingBuffer(maxlen=500),
-                oi_hist=RingBuffer(maxlen=500),
-                basis_hist=RingBuffer(maxlen=500),
+                funding_hist=NumericRingBuffer(maxlen=500),
+                oi_hist=NumericRingBuffer(maxlen=500),
+                basis_hist=NumericRingBuffer(maxlen=500),
             )
         return self.derivs[symbol]
 
     def update(self, ev: BaseEvent) -> None:
-        if ev.etype == EventType.TRADE_PRINT:
-            self._update_trade(ev)  # type: ignore[arg-type]
-        elif ev.etype == EventType.BOOK_DELTA:
-            self._update_book(ev)   # type: ignore[arg-type]
-        elif ev.etype == EventType.FUNDING_TICK:
-            self._update_funding(ev)  # type: ignore[arg-type]
-        elif ev.etype == EventType.OI_TICK:
-            self._update_oi(ev)        # type: ignore[arg-type]
-        elif ev.etype == EventType.BASIS_TICK:
-            self._update_basis(ev)     # type: ignore[arg-type]
+        fn = self._dispatch.get(ev.etype)
+        if fn is not None:
+            fn(ev)
 
     def _update_trade(self, t: TradePrint) -> None:
+        # Trades are micro-batched per symbol and folded into the scale rings in one
+        # vectorized pass (on snapshot, or once the batch is full).
         self.trade_count[t.symbol] += 1
-        sign = 0.0
-        if t.side == TradeSide.BUY:
-            sign = 1.0
-        elif t.side == TradeSide.SELL:
-            sign = -1.0
+        pending = self._pending_trades[t.symbol]
+        pending.append((t.price, t.size, _SIDE_SIGN.get(t.side, 0.0)))
+        if len(pending) >= TRADE_BATCH:
+            self._flush_trades(t.symbol)
+
+    def _flush_trades(self, symbol: Symbol) -> None:
+        pending = self._pending_trades.get(symbol)
+        if not pending:
+            return
+        batch = np.array(pending, dtype=np.float64)
+        pending.clear()
+        price = batch[:, 0]
+        size = batch[:, 1]
+        signed = batch[:, 2] * size
 
         for scale in self.scales:
-            st = self._get_scale_state(t.symbol, scale)
-            if st.last_price is None:
-                st.last_price = t.price
-            ret = (t.price - st.last_price)
-            st.last_price = t.price
-
-            st.prices.append(t.price)
-            st.rets.append(ret)
-            st.sizes.append(t.size)
-            st.signed_sizes.append(sign * t.size)
-            st.cvd += sign * t.size
+            st = self._get_scale_state(symbol, scale)
+            prev = price[0] if st.last_price is None else st.last_price
+            st.last_price = float(price[-1])
+
+            st.prices.extend(price)
+            st.rets.extend(np.diff(price, prepend=prev))
+            st.sizes.extend(size)
+            st.signed_sizes.extend(signed)
+            st.cvd += float(signed.sum())
+            self._sample_vol(st, len(price))
+
+    @staticmethod
+    def _sample_vol(st: ScaleState, k: int) -> None:
+        """Append a VOL_WIN-ret std to vol_hist for every VOL_STEP boundary in the last k rets."""
+        n0, n1 = st.n_rets, st.n_rets + k
+        st.n_rets = n1
+        for m in range((n0 // VOL_STEP + 1) * VOL_STEP, n1 + 1, VOL_STEP):
+            lag = n1 - m  # rets appended after the sample point
+            if m < VOL_WIN or VOL_WIN + lag > len(st.rets):
+                continue
+            st.vol_hist.append(st.rets.last_n(VOL_WIN + lag)[:VOL_WIN].std())
 
     def _update_book(self, b: BookDelta) -> None:
         # store last snapshot; features derived in snapshot()
+        # top-20 levels of both sides stacked once here as price/size vectors (SoA),
+        # so liquidity_potential can reuse them across scales and snapshots
+        levels = np.concatenate((b.bids[:20], b.asks[:20]))
         self.last_book[b.symbol] = {
-            "bids": [(lvl.price, lvl.size) for lvl in b.bids],
-            "asks": [(lvl.price, lvl.size) for lvl in b.asks],
+            "bids": b.bids,   # [N, 2] (price, size)
+            "asks": b.asks,
+            "level_px": np.ascontiguousarray(levels[:, 0]),
+            "level_sz": np.ascontiguousarray(levels[:, 1]),
             "depth_n": b.depth_n,
         }
 
@@ -115,20 +160,28 @@ class MVPFeatureEngine:
     def _update_basis(self, b: BasisTick) -> None:
         d = self._get_deriv_state(b.symbol)
         d.basis = b.basis
+        if len(d.basis_hist) == d.basis_hist.maxlen:
+            del d.basis_sorted[bisect_left(d.basis_sorted, d.basis_hist.oldest())]
         d.basis_hist.append(d.basis)
+        insort(d.basis_sorted, d.basis)
+        d.basis_percentile = bisect_right(d.basis_sorted, d.basis) / len(d.basis_sorted)
 
     def snapshot(self, symbol: Symbol, scale: Scale) -> Dict[str, Any]:
+        self._flush_trades(symbol)
         st = self._get_scale_state(symbol, scale)
         d = self._get_deriv_state(symbol)
 
-        prices = st.prices.values()
+        # only the window ends and length are needed from prices: O(1) ring access, no copy
+        n_prices = len(st.prices)
+        last_price = st.prices.last()
         rets = st.rets.values()
-        sizes = st.sizes.values()
         ssz = st.signed_sizes.values()
+        # window moments come from the rings in O(1); bind once, reused below
+        size_mu = st.sizes.mean()
 
         # realized volatility proxy in price units per print
-        ret_sd = stdev(rets)
-        ret_mu = mean(rets)
+        ret_sd = st.rets.stdev()
+        ret_mu = st.rets.mean()
 
         # directional strength: |mean return| / (std return + eps) -> squash to 0..1
         dir_raw = abs(ret_mu) / (ret_sd + 1e-9)
@@ -137,73 +190,53 @@ class MVPFeatureEngine:
         # mean-reversion proxy: negative autocorr of returns (quick approx)
         mr_score = 0.0
         if len(rets) > 20:
-            r = np.array(rets[-200:], dtype=float)
-            r1 = r[:-1]
-            r2 = r[1:]
-            if r1.std() > 1e-9 and r2.std() > 1e-9:
-                corr = float(np.corrcoef(r1, r2)[0, 1])
+            corr = autocorr1(rets[-200:])
+            if not math.isnan(corr):
                 mr_score = clamp((-corr + 1.0) / 2.0, 0.0, 1.0)  # corr=-1 => 1.0
 
         # CVD slope (simple linear fit)
         cvd_slope = 0.0
         if len(ssz) > 50:
-            y = np.cumsum(np.array(ssz[-300:], dtype=float))
-            x = np.arange(len(y), dtype=float)
-            # slope per step
-            cvd_slope = float(np.polyfit(x, y, 1)[0])
+            # slope per step of the cumulative signed volume
+            cvd_slope = float(cumsum_slope(ssz[-300:]))
 
         # progress in sigma units across the window
         progress_sigma = 0.0
-        if len(prices) > 10:
-            progress = prices[-1] - prices[0]
-            progress_sigma = float(abs(progress) / (ret_sd * max(len(prices),1) ** 0.5 + 1e-9))
+        if n_prices > 10:
+            progress = last_price - st.prices.oldest()
+            progress_sigma = float(abs(progress) / (ret_sd * max(n_prices,1) ** 0.5 + 1e-9))
 
         # volume multiplier: last chunk vs average
         vol_mult = 1.0
-        if len(sizes) > 100:
-            chunk = sizes[-50:]
-            vol_mult = float((mean(chunk) + 1e-9) / (mean(sizes) + 1e-9))
+        if len(st.sizes) > 100:
+            chunk = st.sizes.last_n(50)
+            vol_mult = float((chunk.mean() + 1e-9) / (size_mu + 1e-9))
 
         # tail risk proxy: fraction of |ret| > 2*sd
         tail_risk = 0.0
         if len(rets) > 50 and ret_sd > 1e-9:
-            arr = np.array(rets[-500:], dtype=float)
-            tail_risk = float(np.mean(np.abs(arr) > 2.0 * ret_sd))
+            tail_risk = float(tail_frac(rets[-500:], 2.0 * ret_sd))
 
         # breakout probability proxy: compression + rising directional
         # compression is low ret_sd relative to its history (approx via percentile)
-        vol_hist = []
-        # compute simple rolling std samples from stored rets if enough
-        if len(rets) > 600:
-            rr = np.array(rets, dtype=float)
-            for i in range(0, len(rr) - 200, 50):
-                vol_hist.append(float(rr[i:i+200].std()))
+        # percentile rank of ret_sd among rolling 200-print std samples (every 50 prints)
         vol_percentile = 0.5
-        if vol_hist:
-            vol_hist_sorted = sorted(vol_hist)
-            cur = ret_sd
-            # percentile rank
-            idx = np.searchsorted(vol_hist_sorted, cur, side="right")
-            vol_percentile = float(idx / len(vol_hist_sorted))
+        if len(rets) > 600 and len(st.vol_hist):
+            vol_percentile = float(np.count_nonzero(st.vol_hist.values() <= ret_sd) / len(st.vol_hist))
         breakout_prob = float(clamp((1.0 - vol_percentile) * directional_strength, 0.0, 1.0))
 
         # derivatives z-scores
-        funding_mu, funding_sd = mean(d.funding_hist.values()), stdev(d.funding_hist.values())
+        funding_mu, funding_sd = d.funding_hist.mean(), d.funding_hist.stdev()
         funding_z = float(zscore(d.funding, funding_mu, funding_sd))
 
-        oi_mu, oi_sd = mean(d.oi_hist.values()), stdev(d.oi_hist.values())
+        oi_mu, oi_sd = d.oi_hist.mean(), d.oi_hist.stdev()
         oi_z = float(zscore(d.oi, oi_mu, oi_sd))
 
-        basis_mu, basis_sd = mean(d.basis_hist.values()), stdev(d.basis_hist.values())
+        basis_mu, basis_sd = d.basis_hist.mean(), d.basis_hist.stdev()
         basis_z = float(zscore(d.basis, basis_mu, basis_sd))
 
         # basis percentile (rough)
-        basis_vals = d.basis_hist.values()
-        basis_percentile = 0.5
-        if basis_vals:
-            s = sorted(basis_vals)
-            idx = np.searchsorted(s, d.basis, side="right")
-            basis_percentile = float(idx / len(s))
+        basis_percentile = d.basis_percentile
 
         # squeeze score (very rough): crowded + near thin book (computed in fields later)
         squeeze_score = float(clamp((abs(funding_z) + max(0.0, oi_z)) / 4.0, 0.0, 1.0))
@@ -212,23 +245,23 @@ class MVPFeatureEngine:
         deleveraging_score = float(clamp(max(0.0, -oi_z) * 0.5 + tail_risk, 0.0, 1.0))
 
         # impulse/exhaustion/stoprun proxies
-        impulse_score = float(clamp(directional_strength * abs(cvd_slope) / (mean(sizes)+1e-9) / 10.0, 0.0, 1.0))
+        impulse_score = float(clamp(directional_strength * abs(cvd_slope) / (size_mu+1e-9) / 10.0, 0.0, 1.0))
         exhaustion_score = float(clamp((1.0 - directional_strength) * tail_risk, 0.0, 1.0))
         stoprun_score = float(clamp(tail_risk * vol_mult, 0.0, 1.0))
 
         # book imbalance (if available)
         book = self.last_book.get(symbol)
         book_imbalance = 0.0
-        mid = prices[-1] if prices else 0.0
+        mid = last_price if n_prices else 0.0
         if book:
-            bid_depth = sum(sz for _, sz in book["bids"][:10])
-            ask_depth = sum(sz for _, sz in book["asks"][:10])
+            bid_depth = float(book["bids"][:10, 1].sum())
+            ask_depth = float(book["asks"][:10, 1].sum())
             book_imbalance = float((bid_depth - ask_depth) / (bid_depth + ask_depth + 1e-9))
 
         return {
             "scale": scale.name,
-            "n_trades": len(prices),
-            "last_price": prices[-1] if prices else None,
+            "n_trades": n_prices,
+            "last_price": last_price,
             "ret_sd": ret_sd,
             "directional_strength": directional_strength,
             "mean_reversion_score": mr_score,
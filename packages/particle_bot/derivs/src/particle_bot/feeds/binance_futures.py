@@ -26,19 +26,21 @@ Docs (Binance Open Platform):
 
 import asyncio
 import contextlib
-import json
+import time
 from dataclasses import dataclass
+from functools import partial
 from datetime import datetime, timezone
-from typing import Any, AsyncIterator, Dict, List
+from typing import Any, AsyncIterator, Dict, List, Tuple, Union
 
 import aiohttp
+import numpy as np
+import orjson
 import websockets
 
 from particle_bot.types import (
     BaseEvent,
     BasisTick,
     BookDelta,
-    BookLevel,
     EventType,
     FundingTick,
     OITick,
@@ -51,6 +53,8 @@ from particle_bot.types import (
 
 BINANCE_FSTREAM_BASE = "wss://fstream.binance.com/stream?streams="
 BINANCE_FAPI_REST_BASE = "https://fapi.binance.com"
+REST_TIMEOUT = aiohttp.ClientTimeout(total=5)
+NS_PER_MS = 1_000_000
 
 SYMBOL_MAP = {
     Symbol.BTC: "btcusdt",
@@ -63,80 +67,94 @@ def _ms_to_dt(ms: int) -> datetime:
     return datetime.fromtimestamp(ms / 1000.0, tz=timezone.utc)
 
 
-def _now_utc() -> datetime:
-    return datetime.now(tz=timezone.utc)
+QueueItem = Union[BaseEvent, Tuple[BaseEvent, ...]]
+
+
+async def _emit(q: "asyncio.Queue[QueueItem]", item: QueueItem) -> None:
+    # put_nowait avoids creating a waiter future in the common not-full case
+    try:
+        q.put_nowait(item)
+    except asyncio.QueueFull:
+        await q.put(item)
+
+
+_SYM_FROM_PREFIX = {"BTC": Symbol.BTC, "ETH": Symbol.ETH, "SOL": Symbol.SOL}
 
 
 def _infer_symbol(sym_raw: str) -> Symbol:
-    s = sym_raw.upper()
-    if s.startswith("BTC"):
-        return Symbol.BTC
-    if s.startswith("ETH"):
-        return Symbol.ETH
-    return Symbol.SOL
+    return _SYM_FROM_PREFIX.get(sym_raw[:3].upper(), Symbol.SOL)
+
 
+# Hot-path parsers build events with model_construct: every field is already the
+# declared type, so pydantic validation would only re-check what we just produced.
 
-def _parse_trade(data: Dict[str, Any]) -> TradePrint:
+def _parse_trade(data: Dict[str, Any], emit_meta: bool = False) -> TradePrint:
     # aggTrade fields: p (price), q (qty), T (trade time), m (buyer is maker)
     symbol = _infer_symbol(str(data.get("s", "")))
 
     # If buyer is maker => aggressor sell; else aggressor buy
-    m = bool(data.get("m", False))
-    side = TradeSide.SELL if m else TradeSide.BUY
+    side = TradeSide.SELL if data.get("m") else TradeSide.BUY
 
-    return TradePrint(
-        ts=_ms_to_dt(int(data["T"])),
-        recv_ts=_now_utc(),
+    ev = TradePrint.model_construct(
+        ts_ns=int(data["T"]) * NS_PER_MS,
+        recv_ts_ns=time.time_ns(),
         symbol=symbol,
         venue=Venue.BINANCE,
-        etype=EventType.TRADE_PRINT,
         price=float(data["p"]),
         size=float(data["q"]),
         side=side,
-        meta={
+    )
+    if emit_meta:
+        ev.meta = {
             "stream_event_time_ms": int(data.get("E", data["T"])),
             "agg_id": data.get("a"),
-        },
-    )
+        }
+    return ev
+
 
+def _levels(raw: List[List[str]], descending: bool) -> np.ndarray:
+    """[[px, sz], ...] string pairs -> sorted [N, 2] float64 array."""
+    arr = np.array(raw, dtype=np.float64).reshape(-1, 2)
+    order = np.argsort(-arr[:, 0] if descending else arr[:, 0], kind="stable")
+    return arr[order]
 
-def _parse_depth(data: Dict[str, Any], depth_n: int) -> BookDelta:
+
+def _parse_depth(data: Dict[str, Any], depth_n: int, emit_meta: bool = False) -> BookDelta:
     symbol = _infer_symbol(str(data.get("s", "")))
 
     bids_raw = data.get("b", []) or []
     asks_raw = data.get("a", []) or []
 
-    bids = [BookLevel(price=float(px), size=float(sz)) for px, sz in bids_raw[:depth_n]]
-    asks = [BookLevel(price=float(px), size=float(sz)) for px, sz in asks_raw[:depth_n]]
-
-    bids.sort(key=lambda x: x.price, reverse=True)
-    asks.sort(key=lambda x: x.price)
+    bids = _levels(bids_raw[:depth_n], descending=True)
+    asks = _levels(asks_raw[:depth_n], descending=False)
 
-    ts_ms = int(data.get("T", 0) or data.get("E", 0) or int(_now_utc().timestamp() * 1000))
-    return BookDelta(
-        ts=_ms_to_dt(ts_ms),
-        recv_ts=_now_utc(),
+    recv_ts_ns = time.time_ns()
+    ts_ms = int(data.get("T", 0) or data.get("E", 0) or 0)
+    ev = BookDelta.model_construct(
+        ts_ns=ts_ms * NS_PER_MS if ts_ms else recv_ts_ns,
+        recv_ts_ns=recv_ts_ns,
         symbol=symbol,
         venue=Venue.BINANCE,
-        etype=EventType.BOOK_DELTA,
         bids=bids,
         asks=asks,
         depth_n=depth_n,
-        meta={
+    )
+    if emit_meta:
+        ev.meta = {
             "U": data.get("U"),
             "u": data.get("u"),
             "pu": data.get("pu"),
             "event_time_ms": data.get("E"),
-        },
-    )
+        }
+    return ev
 
 
-def _parse_mark_price(data: Dict[str, Any]) -> List[BaseEvent]:
+def _parse_mark_price(data: Dict[str, Any]) -> Tuple[FundingTick, BasisTick]:
     """markPriceUpdate -> FundingTick + BasisTick (mark - index)."""
     symbol = _infer_symbol(str(data.get("s", "")))
-    event_ms = int(data.get("E", 0) or int(_now_utc().timestamp() * 1000))
-    ts = _ms_to_dt(event_ms)
-    recv_ts = _now_utc()
+    recv_ts_ns = time.time_ns()
+    event_ms = int(data.get("E", 0) or recv_ts_ns // NS_PER_MS)
+    ts_ns = event_ms * NS_PER_MS
 
     mark = float(data.get("p", 0.0))
     index = float(data.get("i", 0.0))
@@ -144,10 +162,10 @@ def _parse_mark_price(data: Dict[str, Any]) -> List[BaseEvent]:
     next_funding_ms = int(data.get("T", 0) or 0)
     next_funding_ts = _ms_to_dt(next_funding_ms) if next_funding_ms else None
 
-    return [
+    return (
         FundingTick(
-            ts=ts,
-            recv_ts=recv_ts,
+            ts_ns=ts_ns,
+            recv_ts_ns=recv_ts_ns,
             symbol=symbol,
             venue=Venue.BINANCE,
             etype=EventType.FUNDING_TICK,
@@ -156,8 +174,8 @@ def _parse_mark_price(data: Dict[str, Any]) -> List[BaseEvent]:
             meta={"mark": mark, "index": index, "event_time_ms": event_ms},
         ),
         BasisTick(
-            ts=ts,
-            recv_ts=recv_ts,
+            ts_ns=ts_ns,
+            recv_ts_ns=recv_ts_ns,
             symbol=symbol,
             venue=Venue.BINANCE,
             etype=EventType.BASIS_TICK,
@@ -165,7 +183,7 @@ def _parse_mark_price(data: Dict[str, Any]) -> List[BaseEvent]:
             basis_type="mark_minus_index",
             meta={"mark": mark, "index": index, "event_time_ms": event_ms},
         ),
-    ]
+    )
 
 
 @dataclass
@@ -185,6 +203,19 @@ class BinanceFuturesStream:
     reconnect_backoff_s: float = 1.0
     max_backoff_s: float = 30.0
 
+    # venue ids/sequence numbers on trades and books; off unless a consumer needs them
+    emit_meta: bool = False
+
+    def __post_init__(self) -> None:
+        self._url = self._build_url()
+        # event type -> parser with this stream's settings bound; markPriceUpdate yields
+        # a (funding, basis) tuple that travels as one queue item
+        self._parsers = {
+            "aggTrade": partial(_parse_trade, emit_meta=self.emit_meta),
+            "depthUpdate": partial(_parse_depth, depth_n=self.depth_n, emit_meta=self.emit_meta),
+            "markPriceUpdate": _parse_mark_price,
+        }
+
     def _build_url(self) -> str:
         streams: List[str] = []
         for sym in self.symbols:
@@ -194,98 +225,103 @@ class BinanceFuturesStream:
             streams.append(f"{s}@markPrice@1s" if self.mark_price_1s else f"{s}@markPrice")
         return BINANCE_FSTREAM_BASE + "/".join(streams)
 
-    async def _ws_loop(self, q: "asyncio.Queue[BaseEvent]") -> None:
-        url = self._build_url()
+    async def _ws_loop(self, q: "asyncio.Queue[QueueItem]") -> None:
+        url = self._url
+        parsers = self._parsers
         backoff = self.reconnect_backoff_s
         while True:
             try:
                 async with websockets.connect(url, ping_interval=20, ping_timeout=20, max_queue=2048) as ws:
                     backoff = self.reconnect_backoff_s
-                    async for msg in ws:
-                        raw = json.loads(msg)
-                        data = raw.get("data", raw)
-                        et = data.get("e")
-                        if et == "aggTrade":
-                            await q.put(_parse_trade(data))
-                        elif et == "depthUpdate":
-                            await q.put(_parse_depth(data, self.depth_n))
-                        elif et == "markPriceUpdate":
-                            for ev in _parse_mark_price(data):
-                                await q.put(ev)
-                        else:
-                            continue
+                    while True:
+                        # raw frame bytes go straight to orjson, skipping the UTF-8 decode to str
+                        # combined streams always wrap the payload in {"stream", "data"}
+                        data = orjson.loads(await ws.recv(decode=False))["data"]
+                        parse = parsers.get(data.get("e"))
+                        if parse is not None:
+                            await _emit(q, parse(data))
             except asyncio.CancelledError:
                 return
             except Exception:
                 await asyncio.sleep(backoff)
                 backoff = min(self.max_backoff_s, backoff * 2)
 
-    async def _rest_loop(self, q: "asyncio.Queue[BaseEvent]") -> None:
+    async def _fetch_oi(self, session: aiohttp.ClientSession, sym: Symbol) -> OITick:
+        url = f"{BINANCE_FAPI_REST_BASE}/fapi/v1/openInterest"
+        params = {"symbol": SYMBOL_MAP[sym].upper()}
+        async with session.get(url, params=params) as r:
+            js = await r.json(loads=orjson.loads)
+
+        oi = float(js.get("openInterest", 0.0))
+        recv_ts_ns = time.time_ns()
+        ts_ms = int(js.get("time", recv_ts_ns // NS_PER_MS))
+        return OITick(
+            ts_ns=ts_ms * NS_PER_MS,
+            recv_ts_ns=recv_ts_ns,
+            symbol=sym,
+            venue=Venue.BINANCE,
+            etype=EventType.OI_TICK,
+            open_interest=oi,
+            meta={"raw": js},
+        )
+
+    async def _fetch_basis(self, session: aiohttp.ClientSession, sym: Symbol) -> BasisTick | None:
+        url = f"{BINANCE_FAPI_REST_BASE}/futures/data/basis"
+        params = {
+            "pair": SYMBOL_MAP[sym].upper(),
+            "contractType": "PERPETUAL",
+            "period": self.basis_period,
+            "limit": 1,
+        }
+        async with session.get(url, params=params) as r:
+            js = await r.json(loads=orjson.loads)
+
+        if not (isinstance(js, list) and js):
+            return None
+        row = js[0]
+        basis = float(row.get("basis", 0.0))
+        recv_ts_ns = time.time_ns()
+        ts_ms = int(row.get("timestamp", recv_ts_ns // NS_PER_MS))
+        return BasisTick(
+            ts_ns=ts_ms * NS_PER_MS,
+            recv_ts_ns=recv_ts_ns,
+            symbol=sym,
+            venue=Venue.BINANCE,
+            etype=EventType.BASIS_TICK,
+            basis=basis,
+            basis_type=f"endpoint_PERPETUAL_{self.basis_period}",
+            meta={"raw": row},
+        )
+
+    async def _rest_loop(self, q: "asyncio.Queue[QueueItem]") -> None:
         """Poll OI + Basis and emit normalized ticks."""
         # small jitter so we don't spike immediately
         await asyncio.sleep(1.0)
 
-        async with aiohttp.ClientSession() as session:
+        # one pooled, keep-alive connector for the life of the loop; per-symbol GETs run concurrently
+        connector = aiohttp.TCPConnector(limit=8, ttl_dns_cache=300, keepalive_timeout=75)
+        async with aiohttp.ClientSession(connector=connector, timeout=REST_TIMEOUT) as session:
             last_oi_poll = 0.0
             last_basis_poll = 0.0
 
             while True:
                 try:
-                    now = asyncio.get_running_loop().time()
+                    now = time.monotonic()
+                    fetches = []
 
                     if self.oi_poll_s > 0 and (now - last_oi_poll) >= self.oi_poll_s:
                         last_oi_poll = now
-                        for sym in self.symbols:
-                            sym_u = SYMBOL_MAP[sym].upper()
-                            url = f"{BINANCE_FAPI_REST_BASE}/fapi/v1/openInterest"
-                            params = {"symbol": sym_u}
-                            async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=5)) as r:
-                                js = await r.json()
-
-                            oi = float(js.get("openInterest", 0.0))
-                            ts_ms = int(js.get("time", int(_now_utc().timestamp() * 1000)))
-                            await q.put(
-                                OITick(
-                                    ts=_ms_to_dt(ts_ms),
-                                    recv_ts=_now_utc(),
-                                    symbol=sym,
-                                    venue=Venue.BINANCE,
-                                    etype=EventType.OI_TICK,
-                                    open_interest=oi,
-                                    meta={"raw": js},
-                                )
-                            )
+                        fetches += [self._fetch_oi(session, sym) for sym in self.symbols]
 
                     if self.basis_poll_s > 0 and (now - last_basis_poll) >= self.basis_poll_s:
                         last_basis_poll = now
-                        for sym in self.symbols:
-                            pair = SYMBOL_MAP[sym].upper()
-                            url = f"{BINANCE_FAPI_REST_BASE}/futures/data/basis"
-                            params = {
-                                "pair": pair,
-                                "contractType": "PERPETUAL",
-                                "period": self.basis_period,
-                                "limit": 1,
-                            }
-                            async with session.get(url, params=params, timeout=aiohttp.ClientTimeout(total=5)) as r:
-                                js = await r.json()
-
-                            if isinstance(js, list) and js:
-                                row = js[0]
-                                basis = float(row.get("basis", 0.0))
-                                ts_ms = int(row.get("timestamp", int(_now_utc().timestamp() * 1000)))
-                                await q.put(
-                                    BasisTick(
-                                        ts=_ms_to_dt(ts_ms),
-                                        recv_ts=_now_utc(),
-                                        symbol=sym,
-                                        venue=Venue.BINANCE,
-                                        etype=EventType.BASIS_TICK,
-                                        basis=basis,
-                                        basis_type=f"endpoint_PERPETUAL_{self.basis_period}",
-                                        meta={"raw": row},
-                                    )
-                                )
+                        fetches += [self._fetch_basis(session, sym) for sym in self.symbols]
+
+                    if fetches:
+                        # a failed symbol is skipped this round; transient HTTP errors are common
+                        for ev in await asyncio.gather(*fetches, return_exceptions=True):
+                            if isinstance(ev, BaseEvent):
+                                await _emit(q, ev)
 
                     await asyncio.sleep(0.25)
                 except asyncio.CancelledError:
@@ -296,13 +332,24 @@ class BinanceFuturesStream:
 
     async def events(self) -> AsyncIterator[BaseEvent]:
         """Merged event iterator (WS + REST)."""
-        q: asyncio.Queue[BaseEvent] = asyncio.Queue(maxsize=5000)
+        q: asyncio.Queue[QueueItem] = asyncio.Queue(maxsize=5000)
         ws_task = asyncio.create_task(self._ws_loop(q))
         rest_task = asyncio.create_task(self._rest_loop(q))
 
         try:
             while True:
-                yield await q.get()
+                item = await q.get()
+                # drain whatever else is already queued before suspending again
+                while True:
+                    if isinstance(item, tuple):
+                        for ev in item:
+                            yield ev
+                    else:
+                        yield item
+                    try:
+                        item = q.get_nowait()
+                    except asyncio.QueueEmpty:
+                        break
         finally:
             ws_task.cancel()
             rest_task.cancel()
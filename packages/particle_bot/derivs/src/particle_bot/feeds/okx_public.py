@@ -1,13 +1,14 @@
 from __future__ import annotations
 import asyncio
-import json
+import time
 from dataclasses import dataclass
-from datetime import datetime, timezone
 from typing import AsyncIterator, Dict, Any, List
 
+import numpy as np
+import orjson
 import websockets
 
-from particle_bot.types import Symbol, Venue, EventType, TradePrint, BookDelta, BookLevel, TradeSide, BaseEvent
+from particle_bot.types import Symbol, Venue, EventType, TradePrint, BookDelta, TradeSide, BaseEvent
 
 # OKX WS public endpoint and subscription format:
 # - Public WebSocket: wss://ws.okx.com:8443/ws/v5/public
@@ -22,11 +23,7 @@ INST_MAP = {
     Symbol.SOL: "SOL-USDT",
 }
 
-def _now_utc() -> datetime:
-    return datetime.now(tz=timezone.utc)
-
-def _ms_to_dt(ms: int) -> datetime:
-    return datetime.fromtimestamp(ms / 1000.0, tz=timezone.utc)
+NS_PER_MS = 1_000_000
 
 def _parse_trade(msg: Dict[str, Any]) -> List[TradePrint]:
     # OKX trades message includes data array: each item has px, sz, side, ts
@@ -39,8 +36,8 @@ def _parse_trade(msg: Dict[str, Any]) -> List[TradePrint]:
         side_raw = str(t.get("side", "")).lower()
         side = TradeSide.BUY if side_raw == "buy" else TradeSide.SELL if side_raw == "sell" else TradeSide.UNKNOWN
         out.append(TradePrint(
-            ts=_ms_to_dt(int(t["ts"])),
-            recv_ts=_now_utc(),
+            ts_ns=int(t["ts"]) * NS_PER_MS,
+            recv_ts_ns=time.time_ns(),
             symbol=symbol,
             venue=Venue.OKX,
             etype=EventType.TRADE_PRINT,
@@ -51,6 +48,12 @@ def _parse_trade(msg: Dict[str, Any]) -> List[TradePrint]:
         ))
     return out
 
+def _levels(raw: List[List[str]], descending: bool) -> np.ndarray:
+    # OKX levels are [px, sz, liquidated_orders, n_orders]; keep price/size
+    arr = np.array([lvl[:2] for lvl in raw], dtype=np.float64).reshape(-1, 2)
+    order = np.argsort(-arr[:, 0] if descending else arr[:, 0], kind="stable")
+    return arr[order]
+
 def _parse_books(msg: Dict[str, Any], depth_n: int) -> BookDelta | None:
     arg = msg.get("arg", {})
     inst = arg.get("instId", "")
@@ -62,16 +65,14 @@ def _parse_books(msg: Dict[str, Any], depth_n: int) -> BookDelta | None:
     bids_raw = d0.get("bids", []) or []
     asks_raw = d0.get("asks", []) or []
 
-    bids = [BookLevel(price=float(px), size=float(sz)) for px, sz, *_ in bids_raw[:depth_n]]
-    asks = [BookLevel(price=float(px), size=float(sz)) for px, sz, *_ in asks_raw[:depth_n]]
+    bids = _levels(bids_raw[:depth_n], descending=True)
+    asks = _levels(asks_raw[:depth_n], descending=False)
 
-    bids.sort(key=lambda x: x.price, reverse=True)
-    asks.sort(key=lambda x: x.price)
-
-    ts_ms = int(d0.get("ts", int(_now_utc().timestamp()*1000)))
+    recv_ts_ns = time.time_ns()
+    ts_ms = int(d0.get("ts", recv_ts_ns // NS_PER_MS))
     return BookDelta(
-        ts=_ms_to_dt(ts_ms),
-        recv_ts=_now_utc(),
+        ts_ns=ts_ms * NS_PER_MS,
+        recv_ts_ns=recv_ts_ns,
         symbol=symbol,
         venue=Venue.OKX,
         etype=EventType.BOOK_DELTA,
@@ -88,14 +89,22 @@ class OKXPublicStream:
     reconnect_backoff_s: float = 1.0
     max_backoff_s: float = 30.0
 
-    async def _subscribe(self, ws) -> None:
+    def __post_init__(self) -> None:
+        # serialized once; resent verbatim on every reconnect
+        self._sub_frame = self._build_subscribe_frame()
+
+    def _build_subscribe_frame(self) -> str:
         args = []
         for sym in self.symbols:
             inst = INST_MAP[sym]
             args.append({"channel": "trades", "instId": inst})
             args.append({"channel": "books", "instId": inst})
         req = {"id": "particle-bot", "op": "subscribe", "args": args}
-        await ws.send(json.dumps(req))
+        # str so it goes out as a text frame, which is what OKX expects
+        return orjson.dumps(req).decode()
+
+    async def _subscribe(self, ws) -> None:
+        await ws.send(self._sub_frame)
 
     async def events(self) -> AsyncIterator[BaseEvent]:
         backoff = self.reconnect_backoff_s
@@ -104,8 +113,9 @@ class OKXPublicStream:
                 async with websockets.connect(OKX_PUBLIC_URL, ping_interval=20, ping_timeout=20, max_queue=1024) as ws:
                     await self._subscribe(ws)
                     backoff = self.reconnect_backoff_s
-                    async for msg in ws:
-                        raw = json.loads(msg)
+                    while True:
+                        # raw frame bytes go straight to orjson, skipping the UTF-8 decode to str
+                        raw = orjson.loads(await ws.recv(decode=False))
                         if "event" in raw:
                             # subscribe ack, error, etc.
                             continue
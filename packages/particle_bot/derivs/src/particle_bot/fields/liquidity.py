@@ -1,32 +1,58 @@
 from __future__ import annotations
-from typing import Dict, Any, Tuple
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple
 import numpy as np
 
-def build_price_grid(p0: float, sigma: float, n: int = 401) -> np.ndarray:
+@lru_cache(maxsize=None)
+def _unit_grid(n: int) -> np.ndarray:
+    return np.linspace(-1.0, 1.0, n)
+
+def build_price_grid(p0: float, sigma: float, n: int = 401, out: Optional[np.ndarray] = None) -> np.ndarray:
     span = 6.0 * max(sigma, 1e-9)
-    return np.linspace(p0 - span, p0 + span, n)
+    if out is None:
+        return np.linspace(p0 - span, p0 + span, n)
+    # refill a preallocated grid: p0 + span * linspace(-1, 1, n)
+    np.multiply(_unit_grid(n), span, out=out)
+    out += p0
+    return out
 
-def liquidity_potential(grid: np.ndarray, book: Dict[str, Any] | None, p0: float) -> np.ndarray:
+def liquidity_potential(
+    grid: np.ndarray,
+    book: Dict[str, Any] | None,
+    p0: float,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
     """Construct a simple potential where high depth == low potential (attractor).
     We invert depth so wells are negative values.
     """
-    U = np.zeros_like(grid)
+    if out is None:
+        U = np.zeros_like(grid)
+    else:
+        U = out
+        U[:] = 0.0
 
     if not book:
         return U
 
-    bids = book.get("bids", [])
-    asks = book.get("asks", [])
-    # Turn discrete depths into gaussian bumps around each level
-    def add_levels(levels, sign):
-        for px, sz in levels[:20]:
-            width = max(1.0, abs(px - p0) * 0.02 + 5.0)
-            bump = np.exp(-0.5 * ((grid - px) / width) ** 2) * sz
+    # Turn discrete depths into gaussian bumps around each level: top 20 of each side
+    # as (L,) price/size vectors (prebuilt by the feature engine when available),
+    # accumulated in one (n, L) @ (L,) product
+    if "level_px" in book:
+        px, sz = book["level_px"], book["level_sz"]
+    else:
+        levels = np.concatenate([
+            np.asarray(book.get("bids", []), dtype=float).reshape(-1, 2)[:20],
+            np.asarray(book.get("asks", []), dtype=float).reshape(-1, 2)[:20],
+        ])
+        px, sz = levels[:, 0], levels[:, 1]
+    if len(px):
+        width = np.maximum(1.0, np.abs(px - p0) * 0.02 + 5.0)
+        # bumps are < 1e-7 beyond 6 widths; only evaluate the grid band they jointly cover
+        lo, hi = np.searchsorted(grid, ((px - 6.0 * width).min(), (px + 6.0 * width).max()))
+        if lo < hi:
+            d = (grid[lo:hi, None] - px[None, :]) / width[None, :]
             # more depth -> more attractive -> lower U
-            U[:] -= bump * 0.002
-
-    add_levels(bids, -1)
-    add_levels(asks, +1)
+            U[lo:hi] -= 0.002 * (np.exp(-0.5 * d * d) @ sz)
 
     # gentle restoring term to keep numeric sane
     U += 1e-6 * (grid - p0) ** 2
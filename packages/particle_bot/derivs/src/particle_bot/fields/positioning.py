@@ -1,12 +1,22 @@
 from __future__ import annotations
-from typing import Dict, Any
+from typing import Dict, Any, Optional
 import numpy as np
 
-def positioning_potential(grid: np.ndarray, features: Dict[str, Any], p0: float, sigma: float) -> np.ndarray:
+def positioning_potential(
+    grid: np.ndarray,
+    features: Dict[str, Any],
+    p0: float,
+    sigma: float,
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
     """Crowding pressure: create a hump against the direction of crowded positioning.
     This is a crude MVP. Replace with liquidation bands later.
     """
-    U = np.zeros_like(grid)
+    if out is None:
+        U = np.zeros_like(grid)
+    else:
+        U = out
+        U[:] = 0.0
     fz = float(features.get("funding_z", 0.0) or 0.0)
     oiz = float(features.get("oi_z", 0.0) or 0.0)
     bz = float(features.get("basis_z", 0.0) or 0.0)
@@ -25,7 +35,10 @@ def positioning_potential(grid: np.ndarray, features: Dict[str, Any], p0: float,
     center = p0 + direction * 2.0 * max(sigma, 1e-9) * 10.0  # sigma in price/print; scale up
     width = 2.5 * max(sigma, 1e-9) * 10.0
 
-    hump = np.exp(-0.5 * ((grid - center) / width) ** 2)
-    U += hump * crowd * 0.75  # higher U => repulsive barrier
+    # the hump is < 1e-7 beyond 6 widths; only evaluate it on that support (grid is sorted)
+    lo, hi = np.searchsorted(grid, (center - 6.0 * width, center + 6.0 * width))
+    if lo < hi:
+        d = (grid[lo:hi] - center) * (1.0 / width)
+        U[lo:hi] = np.exp(-0.5 * d * d) * (crowd * 0.75)  # higher U => repulsive barrier
 
     return U
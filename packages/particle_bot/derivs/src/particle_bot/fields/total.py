@@ -1,15 +1,53 @@
 from __future__ import annotations
-from typing import Dict
+from dataclasses import dataclass, field
+from typing import Dict, Optional
 import numpy as np
 
-def total_potential(components: Dict[str, np.ndarray], weights: Dict[str, float]) -> np.ndarray:
+@dataclass
+class FieldContext:
+    """Preallocated grid and potential buffers, refilled in place on every field build."""
+    n: int = 401
+    grid: np.ndarray = field(init=False)
+    U_liq: np.ndarray = field(init=False)
+    U_pos: np.ndarray = field(init=False)
+    U: np.ndarray = field(init=False)
+    gradU: np.ndarray = field(init=False)
+
+    def __post_init__(self) -> None:
+        self.grid = np.empty(self.n)
+        self.U_liq = np.empty(self.n)
+        self.U_pos = np.empty(self.n)
+        self.U = np.empty(self.n)
+        self.gradU = np.empty(self.n)
+
+def total_potential(
+    components: Dict[str, np.ndarray],
+    weights: Dict[str, float],
+    out: Optional[np.ndarray] = None,
+) -> np.ndarray:
     keys = list(components.keys())
     if not keys:
         raise ValueError("No potential components provided")
-    U = np.zeros_like(components[keys[0]])
-    for k, arr in components.items():
-        U += weights.get(k, 1.0) * arr
+    # accumulate in one buffer; unit weights (the common case) add without a scaled temporary
+    U = np.multiply(components[keys[0]], weights.get(keys[0], 1.0), out=out)
+    for k in keys[1:]:
+        w = weights.get(k, 1.0)
+        if w == 1.0:
+            U += components[k]
+        else:
+            U += w * components[k]
     return U
 
-def grad(U: np.ndarray, grid: np.ndarray) -> np.ndarray:
-    return np.gradient(U, grid)
+def uniform_gradient(U: np.ndarray, inv_dp: float, out: Optional[np.ndarray] = None) -> np.ndarray:
+    """dU/dp on a uniform grid: centered differences inside, one-sided at the edges."""
+    if out is None:
+        out = np.empty_like(U)
+    np.subtract(U[2:], U[:-2], out=out[1:-1])
+    out[1:-1] *= 0.5 * inv_dp
+    out[0] = (U[1] - U[0]) * inv_dp
+    out[-1] = (U[-1] - U[-2]) * inv_dp
+    return out
+
+def grad(U: np.ndarray, grid: np.ndarray, out: Optional[np.ndarray] = None) -> np.ndarray:
+    # grids come from build_price_grid (np.linspace), so spacing is uniform
+    return uniform_gradient(U, 1.0 / float(grid[1] - grid[0]), out=out)
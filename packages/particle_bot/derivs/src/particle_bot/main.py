@@ -2,11 +2,14 @@ from __future__ import annotations
 import argparse
 import json
 import asyncio
+import os
+from dataclasses import dataclass, field
 from pathlib import Path
 from typing import Dict, Any, List, Optional
 
 import yaml
 import numpy as np
+import orjson
 
 from particle_bot.types import Symbol, EventType, BaseEvent, Venue
 from particle_bot.scales import Scale, DEFAULT_SCALES
@@ -16,7 +19,7 @@ from particle_bot.features.mvp import MVPFeatureEngine
 from particle_bot.regimes.stacker import build_regime_stack
 from particle_bot.fields.liquidity import build_price_grid, liquidity_potential
 from particle_bot.fields.positioning import positioning_potential
-from particle_bot.fields.total import total_potential
+from particle_bot.fields.total import FieldContext, total_potential, grad
 from particle_bot.forecast.trajectory import simulate_paths, cone_summary
 
 from particle_bot.recording.jsonl import JSONLRecorder, iter_events
@@ -47,7 +50,19 @@ def parse_scales(cfg: Dict[str, Any]) -> List[Scale]:
 
 def _open_jsonl(path: Path):
     path.parent.mkdir(parents=True, exist_ok=True)
-    return open(path, "a", encoding="utf-8")
+    # 1 MiB userland buffer: snapshot lines reach the kernel in large writes
+    return open(path, "ab", buffering=1 << 20)
+
+
+def _close_jsonl(fh) -> None:
+    fh.flush()
+    os.fsync(fh.fileno())
+    fh.close()
+
+
+def _dump_snapshot(snap: Dict[str, Any]) -> bytes:
+    # features carry numpy scalars; orjson serializes them natively
+    return orjson.dumps(snap, option=orjson.OPT_SERIALIZE_NUMPY) + b"\n"
 
 
 def build_pipeline(cfg: Dict[str, Any]):
@@ -67,6 +82,15 @@ def build_pipeline(cfg: Dict[str, Any]):
     return scales, snapshot_every, cone_steps, n_paths, book_depth, feat, bus
 
 
+@dataclass
+class _SnapshotState:
+    trade_counter: int = 0
+    # per-symbol (n_paths, cone_steps + 1) path matrices reused across snapshots
+    paths_buf: Dict[Symbol, np.ndarray] = field(default_factory=dict)
+    # per-symbol field buffers, one context per scale
+    field_ctx: Dict[Symbol, List[FieldContext]] = field(default_factory=dict)
+
+
 def make_snapshot_callback(
     scales: List[Scale],
     feat: MVPFeatureEngine,
@@ -75,33 +99,52 @@ def make_snapshot_callback(
     n_paths: int,
     seed: int,
 ):
-    trade_counter = 0
+    state = _SnapshotState()
+
+    def build_fields(ctx: FieldContext, p0: float, sigma_local: float, f: Dict[str, Any], book: Optional[Dict[str, Any]]):
+        grid = build_price_grid(p0, sigma_local, ctx.n, out=ctx.grid)
+        U_liq = liquidity_potential(grid, book, p0, out=ctx.U_liq)
+        U_pos = positioning_potential(grid, f, p0, sigma_local, out=ctx.U_pos)
+        U = total_potential({"liq": U_liq, "pos": U_pos}, weights={"liq": 1.0, "pos": 1.0}, out=ctx.U)
+        return grid, U, grad(U, grid, out=ctx.gradU)
 
     def on_event(ev: BaseEvent) -> Optional[Dict[str, Any]]:
-        nonlocal trade_counter
         if ev.etype != EventType.TRADE_PRINT:
             return None
 
-        trade_counter += 1
-        if trade_counter % snapshot_every != 0:
+        state.trade_counter += 1
+        if state.trade_counter % snapshot_every != 0:
             return None
 
         symbol = ev.symbol
         scale_snaps = []
-
-        for sc in scales:
+        book = feat.last_book.get(symbol)
+
+        # cone_summary copies what it needs out of the paths, so scales can share one buffer
+        paths_buf = state.paths_buf.get(symbol)
+        if paths_buf is None:
+            paths_buf = state.paths_buf[symbol] = np.empty((n_paths, cone_steps + 1), dtype=float)
+        ctxs = state.field_ctx.get(symbol)
+        if ctxs is None:
+            ctxs = state.field_ctx[symbol] = [FieldContext() for _ in scales]
+
+        # Book and derivatives state are fixed for the whole snapshot, so the fields only
+        # depend on (p0, sigma); scales that agree (e.g. windows not yet full) share them.
+        # Each scale owns a FieldContext, so distinct keys never alias the same buffers.
+        fields: Dict[tuple, tuple] = {}
+
+        for i, sc in enumerate(scales):
             f = feat.snapshot(symbol, sc)
             reg = build_regime_stack(f)
 
             p0 = f.get("last_price")
             sigma_local = f.get("ret_sd", 0.0)
-            book = feat.last_book.get(symbol)
 
             if p0 is not None and sigma_local is not None:
-                grid = build_price_grid(float(p0), float(sigma_local))
-                U_liq = liquidity_potential(grid, book, float(p0))
-                U_pos = positioning_potential(grid, f, float(p0), float(sigma_local))
-                U = total_potential({"liq": U_liq, "pos": U_pos}, weights={"liq": 1.0, "pos": 1.0})
+                key = (float(p0), float(sigma_local))
+                if key not in fields:
+                    fields[key] = build_fields(ctxs[i], key[0], key[1], f, book)
+                grid, U, gradU = fields[key]
 
                 F_flow = float(np.tanh(f.get("cvd_slope", 0.0) / 50.0))
 
@@ -123,6 +166,8 @@ def make_snapshot_callback(
                     steps=cone_steps,
                     n_paths=n_paths,
                     seed=seed,
+                    gradU=gradU,
+                    out=paths_buf,
                 )
                 cone = cone_summary(paths)
             else:
@@ -144,6 +189,40 @@ def make_snapshot_callback(
     return on_event
 
 
+async def _record_events(rec_q: asyncio.Queue, recorder: JSONLRecorder) -> None:
+    """Persist events off the consume loop, in batches of whatever is queued (None stops)."""
+    while True:
+        batch = [await rec_q.get()]
+        while len(batch) < 512:
+            try:
+                batch.append(rec_q.get_nowait())
+            except asyncio.QueueEmpty:
+                break
+        stop = batch[-1] is None
+        recorder.write_events([ev for ev in batch if ev is not None])
+        if stop:
+            return
+
+
+async def _enqueue_record(rec_q: asyncio.Queue, writer_task: asyncio.Task, ev: Any) -> None:
+    """Hand an event to the writer; re-raise the writer's error if it has died."""
+    if writer_task.done():
+        writer_task.result()
+        raise RuntimeError("event writer stopped")
+    try:
+        rec_q.put_nowait(ev)
+        return
+    except asyncio.QueueFull:
+        pass
+    # queue full: wait for room, but not past the writer dying (nothing would drain it)
+    put = asyncio.ensure_future(rec_q.put(ev))
+    await asyncio.wait({put, writer_task}, return_when=asyncio.FIRST_COMPLETED)
+    if not put.done():
+        put.cancel()
+        writer_task.result()
+        raise RuntimeError("event writer stopped")
+
+
 async def run_live(
     venue: Venue,
     symbols: List[Symbol],
@@ -177,27 +256,34 @@ async def run_live(
     else:
         raise ValueError(f"Unsupported live venue: {venue}")
 
+    rec_q: Optional[asyncio.Queue] = asyncio.Queue(maxsize=10000) if recorder else None
+    writer_task = asyncio.create_task(_record_events(rec_q, recorder)) if recorder else None
+
     n = 0
     try:
         async for ev in ev_iter:
             n += 1
-            if recorder:
-                recorder.write_event(ev)
+            if writer_task is not None:
+                await _enqueue_record(rec_q, writer_task, ev)
             bus.publish(ev)
 
             snap = snap_cb(ev)
             if snap:
-                snap_fh.write(json.dumps(snap, separators=(",", ":")) + "\n")
-                if (n % 200) == 0:
-                    snap_fh.flush()
+                snap_fh.write(_dump_snapshot(snap))
 
             if max_events > 0 and n >= max_events:
                 break
     finally:
-        snap_fh.flush()
-        snap_fh.close()
+        _close_jsonl(snap_fh)
         if recorder:
-            recorder.close()
+            try:
+                if writer_task is not None:
+                    if not writer_task.done():
+                        await _enqueue_record(rec_q, writer_task, None)
+                    # also when already done, so a writer error propagates
+                    await writer_task
+            finally:
+                recorder.close()
 
 
 def run_replayfile(
@@ -219,15 +305,12 @@ def run_replayfile(
 
         snap = snap_cb(ev)
         if snap:
-            snap_fh.write(json.dumps(snap, separators=(",", ":")) + "\n")
-            if (n % 200) == 0:
-                snap_fh.flush()
+            snap_fh.write(_dump_snapshot(snap))
 
         if max_events > 0 and n >= max_events:
             break
 
-    snap_fh.flush()
-    snap_fh.close()
+    _close_jsonl(snap_fh)
 
 
 def run_synthetic(
@@ -284,6 +367,11 @@ def main() -> None:
 
     if args.mode == "record":
         out_events = Path(args.events) if args.events else None
+        try:
+            import uvloop
+            uvloop.install()
+        except ImportError:
+            pass
         asyncio.run(run_live(
             venue=venue,
             symbols=symbols,
@@ -1,8 +1,12 @@
 from __future__ import annotations
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Optional, Iterable, Iterator, Dict, Any
-import json
+from operator import attrgetter
+from typing import Optional, Iterable, Iterator, Dict, Any, Callable, Type
+import mmap
+import os
+import numpy as np
+import orjson
 from datetime import datetime, timezone
 
 from particle_bot.types import (
@@ -21,18 +25,17 @@ EVENT_MODEL_BY_TYPE = {
     EventType.MACRO_SNAPSHOT: MacroSnapshot,
 }
 
+# keyed by the raw "etype" string, so replay skips the str -> EventType lookup per line
+_MODEL_BY_ETYPE_STR: Dict[str, Type[BaseEvent]] = {et.value: model for et, model in EVENT_MODEL_BY_TYPE.items()}
+
+_NS_FIELDS = {"ts_ns", "recv_ts_ns"}
+_ORJSON_OPTS = orjson.OPT_APPEND_NEWLINE | orjson.OPT_SERIALIZE_NUMPY
+
 def _dt_to_iso(dt: datetime) -> str:
     if dt.tzinfo is None:
         dt = dt.replace(tzinfo=timezone.utc)
     return dt.isoformat()
 
-def _iso_to_dt(s: str) -> datetime:
-    # Python 3.11+ supports fromisoformat with offsets; we assume UTC 'Z' not used.
-    dt = datetime.fromisoformat(s)
-    if dt.tzinfo is None:
-        dt = dt.replace(tzinfo=timezone.utc)
-    return dt
-
 @dataclass
 class JSONLRecorder:
     path: Path
@@ -42,7 +45,8 @@ class JSONLRecorder:
 
     def __post_init__(self) -> None:
         self.path.parent.mkdir(parents=True, exist_ok=True)
-        self._fh = open(self.path, "a", encoding="utf-8")
+        # binary + 1 MiB buffer: orjson emits bytes and batches reach the kernel in large writes
+        self._fh = open(self.path, "ab", buffering=1 << 20)
 
     def close(self) -> None:
         if self._fh:
@@ -51,31 +55,74 @@ class JSONLRecorder:
             self._fh = None
 
     def write_event(self, ev: BaseEvent) -> None:
+        self.write_events((ev,))
+
+    def write_events(self, events: Iterable[BaseEvent]) -> None:
+        """Serialize a batch and hand it to the file in one write."""
         assert self._fh is not None
-        d = ev.model_dump()
-        # Ensure datetimes are ISO strings (pydantic may already do this, but keep explicit).
-        d["ts"] = _dt_to_iso(ev.ts)
-        d["recv_ts"] = _dt_to_iso(ev.recv_ts)
-        self._fh.write(json.dumps(d, separators=(",", ":")) + "\n")
-        self._n += 1
-        if self._n % self.flush_every == 0:
+        lines = [_encode(ev) for ev in events]
+        if not lines:
+            return
+        self._fh.write(b"".join(lines))
+        n0 = self._n
+        self._n += len(lines)
+        if self._n // self.flush_every != n0 // self.flush_every:
             self._fh.flush()
 
+def _levels_to_list(v: np.ndarray) -> list:
+    # same layout as BookDelta's field serializer
+    return [{"price": px, "size": sz} for px, sz in v.tolist()]
+
+# fields whose in-memory form differs from the file format
+_FIELD_CONVERTERS: Dict[str, Callable[[Any], Any]] = {"bids": _levels_to_list, "asks": _levels_to_list}
+
+def _make_encoder(model: type) -> Callable[[BaseEvent], bytes]:
+    """Fixed-layout encoder for one event model: field names and getters are resolved once
+    here instead of walking pydantic metadata through model_dump on every write."""
+    names = tuple(f for f in model.model_fields if f not in _NS_FIELDS)
+    get = attrgetter(*names)
+    conv = tuple((i, _FIELD_CONVERTERS[n]) for i, n in enumerate(names) if n in _FIELD_CONVERTERS)
+
+    def encode(ev: BaseEvent) -> bytes:
+        values = get(ev)
+        if conv:
+            values = list(values)
+            for i, fn in conv:
+                values[i] = fn(values[i])
+        # Events carry epoch-ns; the file format keeps ISO datetimes (orjson emits RFC 3339).
+        d = {"ts": ev.ts, "recv_ts": ev.recv_ts}
+        d.update(zip(names, values))
+        return orjson.dumps(d, option=_ORJSON_OPTS)
+
+    return encode
+
+_ENCODERS: Dict[EventType, Callable[[BaseEvent], bytes]] = {
+    et: _make_encoder(model) for et, model in EVENT_MODEL_BY_TYPE.items()
+}
+
+def _encode(ev: BaseEvent) -> bytes:
+    enc = _ENCODERS.get(ev.etype)
+    if enc is not None:
+        return enc(ev)
+    d = {"ts": _dt_to_iso(ev.ts), "recv_ts": _dt_to_iso(ev.recv_ts)}
+    d.update(ev.model_dump(exclude=_NS_FIELDS))
+    return orjson.dumps(d, option=_ORJSON_OPTS)
+
 def iter_events(path: Path) -> Iterator[BaseEvent]:
-    with open(path, "r", encoding="utf-8") as f:
-        for line in f:
-            line = line.strip()
-            if not line:
-                continue
-            raw: Dict[str, Any] = json.loads(line)
-            et = EventType(raw["etype"])
-            model = EVENT_MODEL_BY_TYPE.get(et)
-            if model is None:
-                # fall back to BaseEvent
-                raw["ts"] = _iso_to_dt(raw["ts"])
-                raw["recv_ts"] = _iso_to_dt(raw["recv_ts"])
-                yield BaseEvent(**raw)
-            else:
-                raw["ts"] = _iso_to_dt(raw["ts"])
-                raw["recv_ts"] = _iso_to_dt(raw["recv_ts"])
-                yield model(**raw)
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+        # scan the mapped file for newlines and hand each slice to orjson; no per-line str decode
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            i, end = 0, len(mm)
+            while i < end:
+                j = mm.find(b"\n", i)
+                if j == -1:
+                    j = end
+                line = mm[i:j]
+                i = j + 1
+                if not line.strip():
+                    continue
+                raw: Dict[str, Any] = orjson.loads(line)
+                # ISO ts / recv_ts strings are converted to epoch-ns by the BaseEvent validator
+                yield _MODEL_BY_ETYPE_STR.get(raw["etype"], BaseEvent).model_validate(raw)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 from typing import Dict, Any
-from particle_bot.regimes.rules import kingdom, phylum, clazz, family
+from particle_bot.regimes.rules import classify, feature_vector
 from particle_bot.regimes.taxonomy import RegimeStack
 from particle_bot.utils.stats import clamp
 
@@ -10,10 +10,7 @@ def build_regime_stack(f: Dict[str, Any]) -> RegimeStack:
     if f.get("tail_risk", 0.0) > 0.7 and f.get("vol_percentile", 0.5) > 0.75:
         univ = "risk_off"
 
-    k, kp = kingdom(f)
-    p, pp = phylum(f)
-    c, cp = clazz(f)
-    fam, fp = family(f)
+    (k, kp), (p, pp), (c, cp), (fam, fp) = classify(feature_vector(f))
 
     # Order/Genus/Species MVP placeholders (filled with fields + cone later)
     order = "liquidity_topology_pending"
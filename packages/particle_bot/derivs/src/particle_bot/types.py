@@ -1,8 +1,27 @@
 from __future__ import annotations
-from pydantic import BaseModel, Field
+import numpy as np
+from pydantic import BaseModel, ConfigDict, Field, field_serializer, field_validator, model_validator
 from enum import Enum
 from typing import Optional, Literal, Dict, Any
-from datetime import datetime
+from datetime import datetime, timedelta, timezone
+
+_EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+_US = timedelta(microseconds=1)
+
+
+def to_ns(v: Any) -> int:
+    """Epoch nanoseconds from a datetime, ISO string or int (already ns)."""
+    if isinstance(v, str):
+        v = datetime.fromisoformat(v)
+    if isinstance(v, datetime):
+        if v.tzinfo is None:
+            v = v.replace(tzinfo=timezone.utc)
+        return (v - _EPOCH) // _US * 1000
+    return int(v)
+
+
+def ns_to_dt(ns: int) -> datetime:
+    return _EPOCH + timedelta(microseconds=ns // 1000)
 
 
 class Symbol(str, Enum):
@@ -33,13 +52,34 @@ class EventType(str, Enum):
 
 
 class BaseEvent(BaseModel):
-    ts: datetime
-    recv_ts: datetime
+    # epoch nanoseconds; datetimes are only materialized at serialization time
+    ts_ns: int
+    recv_ts_ns: int
     symbol: Symbol
     venue: Venue
     etype: EventType
     meta: Dict[str, Any] = Field(default_factory=dict)
 
+    @model_validator(mode="before")
+    @classmethod
+    def _accept_datetimes(cls, data: Any) -> Any:
+        # ts / recv_ts given as datetime or ISO string (mock feed, recorded JSONL)
+        if isinstance(data, dict) and ("ts" in data or "recv_ts" in data):
+            data = dict(data)
+            if "ts" in data:
+                data["ts_ns"] = to_ns(data.pop("ts"))
+            if "recv_ts" in data:
+                data["recv_ts_ns"] = to_ns(data.pop("recv_ts"))
+        return data
+
+    @property
+    def ts(self) -> datetime:
+        return ns_to_dt(self.ts_ns)
+
+    @property
+    def recv_ts(self) -> datetime:
+        return ns_to_dt(self.recv_ts_ns)
+
 
 class TradeSide(str, Enum):
     BUY = "buy"          # aggressor buy
@@ -60,11 +100,31 @@ class BookLevel(BaseModel):
 
 
 class BookDelta(BaseEvent):
+    model_config = ConfigDict(arbitrary_types_allowed=True)
+
     etype: Literal[EventType.BOOK_DELTA] = EventType.BOOK_DELTA
-    bids: list[BookLevel]   # descending
-    asks: list[BookLevel]   # ascending
+    bids: np.ndarray   # [N, 2] float64 (price, size), descending
+    asks: np.ndarray   # [N, 2] float64 (price, size), ascending
     depth_n: int = 20
 
+    @field_validator("bids", "asks", mode="before")
+    @classmethod
+    def _levels_to_array(cls, v: Any) -> np.ndarray:
+        # BookLevel / {"price","size"} lists (mock feed, recorded JSONL) -> [N, 2] array
+        if isinstance(v, np.ndarray):
+            return v
+        rows = [
+            (lvl.price, lvl.size) if isinstance(lvl, BookLevel)
+            else (lvl["price"], lvl["size"]) if isinstance(lvl, dict)
+            else (lvl[0], lvl[1])
+            for lvl in v
+        ]
+        return np.array(rows, dtype=np.float64).reshape(-1, 2)
+
+    @field_serializer("bids", "asks")
+    def _levels_to_list(self, v: np.ndarray) -> list[Dict[str, float]]:
+        return [{"price": px, "size": sz} for px, sz in v.tolist()]
+
 
 class FundingTick(BaseEvent):
     etype: Literal[EventType.FUNDING_TICK] = EventType.FUNDING_TICK
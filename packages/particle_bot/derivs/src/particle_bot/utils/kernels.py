@@ -0,0 +1,93 @@
+"""Single-pass statistical kernels for MVPFeatureEngine.snapshot.
+
+Compiled with numba when it is installed; otherwise the NumPy versions below are used.
+"""
+from __future__ import annotations
+import math
+from functools import lru_cache
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional
+    njit = None
+
+
+def autocorr1(r: np.ndarray) -> float:
+    """Lag-1 autocorrelation of r; nan when either lagged half is (near) constant."""
+    r1 = r[:-1]
+    r2 = r[1:]
+    if r1.std() > 1e-9 and r2.std() > 1e-9:
+        return float(np.corrcoef(r1, r2)[0, 1])
+    return math.nan
+
+
+@lru_cache(maxsize=64)
+def _cumsum_slope_weights(n: int) -> np.ndarray:
+    # slope = sum_i (i - xbar) * cum_i / Sxx, and cum_i = sum_{k<=i} s_k, so
+    # slope = s @ W with W[k] = sum_{i>=k} (i - xbar) / Sxx
+    k = np.arange(n, dtype=np.float64)
+    xbar = (n - 1) / 2.0
+    sxx = (n - 1) * n * (n + 1) / 12.0
+    return ((n - 1) * n / 2.0 - (k - 1) * k / 2.0 - xbar * (n - k)) / sxx
+
+
+def cumsum_slope(s: np.ndarray) -> float:
+    """Least-squares slope of cumsum(s) against its index, as one dot with constant weights."""
+    return float(s @ _cumsum_slope_weights(len(s)))
+
+
+def tail_frac(r: np.ndarray, thresh: float) -> float:
+    """Fraction of |r| above thresh."""
+    return float(np.mean(np.abs(r) > thresh))
+
+
+if njit is not None:
+    @njit(cache=True, fastmath=True)
+    def autocorr1(r):  # noqa: F811
+        n = r.shape[0] - 1
+        if n < 1:
+            return math.nan
+        m1 = 0.0
+        m2 = 0.0
+        for i in range(n):
+            m1 += r[i]
+            m2 += r[i + 1]
+        m1 /= n
+        m2 /= n
+        s11 = 0.0
+        s22 = 0.0
+        s12 = 0.0
+        for i in range(n):
+            a = r[i] - m1
+            b = r[i + 1] - m2
+            s11 += a * a
+            s22 += b * b
+            s12 += a * b
+        # same degeneracy guard as the NumPy version (population std > 1e-9)
+        if s11 / n <= 1e-18 or s22 / n <= 1e-18:
+            return math.nan
+        return s12 / math.sqrt(s11 * s22)
+
+    @njit(cache=True, fastmath=True)
+    def cumsum_slope(s):  # noqa: F811
+        # running cumsum folded into the closed-form OLS sums; no cumsum array
+        n = s.shape[0]
+        y = 0.0
+        sy = 0.0
+        sxy = 0.0
+        for i in range(n):
+            y += s[i]
+            sy += y
+            sxy += i * y
+        sx = n * (n - 1) / 2.0
+        sxx = (n - 1) * n * (2 * n - 1) / 6.0
+        return (n * sxy - sx * sy) / (n * sxx - sx * sx)
+
+    @njit(cache=True, fastmath=True)
+    def tail_frac(r, thresh):  # noqa: F811
+        c = 0
+        for i in range(r.shape[0]):
+            if abs(r[i]) > thresh:
+                c += 1
+        return c / r.shape[0]
@@ -1,21 +1,142 @@
 from __future__ import annotations
-from collections import deque
-from typing import Deque, Generic, TypeVar, List
+import math
+import numpy as np
 
-T = TypeVar("T")
+from particle_bot.utils.stats import mean_std
 
-class RingBuffer(Generic[T]):
+
+class RingBuffer:
+    """Fixed-capacity float64 ring over a preallocated NumPy array.
+
+    values()/last_n() return views where the window is contiguous; treat them as
+    read-only and don't hold them across appends.
+    """
     def __init__(self, maxlen: int):
-        self.buf: Deque[T] = deque(maxlen=maxlen)
+        self.maxlen = maxlen
+        self._buf = np.empty(maxlen, dtype=np.float64)
+        self._head = 0  # next write slot
+        self._n = 0
+
+    def append(self, x: float) -> None:
+        self._buf[self._head] = x
+        self._head += 1
+        if self._head == self.maxlen:
+            self._head = 0
+        if self._n < self.maxlen:
+            self._n += 1
+
+    def extend(self, xs: np.ndarray) -> None:
+        """Append a batch with at most two slice assignments."""
+        k = len(xs)
+        if k >= self.maxlen:
+            self._buf[:] = xs[k - self.maxlen:]
+            self._head = 0
+            self._n = self.maxlen
+            return
+        end = self._head + k
+        if end <= self.maxlen:
+            self._buf[self._head:end] = xs
+        else:
+            first = self.maxlen - self._head
+            self._buf[self._head:] = xs[:first]
+            self._buf[:end - self.maxlen] = xs[first:]
+        self._head = end % self.maxlen
+        self._n = min(self._n + k, self.maxlen)
 
-    def append(self, x: T) -> None:
-        self.buf.append(x)
+    def oldest(self) -> float | None:
+        """The value the next append will evict once full."""
+        if not self._n:
+            return None
+        return float(self._buf[self._head if self._n == self.maxlen else 0])
 
     def __len__(self) -> int:
-        return len(self.buf)
+        return self._n
+
+    def values(self) -> np.ndarray:
+        """All values, oldest first."""
+        return self.last_n(self._n)
+
+    def last_n(self, k: int) -> np.ndarray:
+        """The newest k values, oldest first; copies only when the window wraps."""
+        k = min(k, self._n)
+        start = self._head - k
+        if start >= 0:
+            return self._buf[start:self._head]
+        return np.concatenate((self._buf[start:], self._buf[:self._head]))
+
+    def last(self) -> float | None:
+        return float(self._buf[self._head - 1]) if self._n else None
+
+
+class NumericRingBuffer(RingBuffer):
+    """RingBuffer that also tracks the window mean and sum of squared deviations.
+
+    Moments are updated online (Welford on append, Chan's merge/removal on extend),
+    so mean()/stdev() are O(1). They are recomputed exactly from the buffer whenever
+    the write head wraps, which bounds the float drift of the sliding updates.
+    """
+    def __init__(self, maxlen: int):
+        super().__init__(maxlen)
+        self._mean = 0.0
+        self._m2 = 0.0
+
+    def append(self, x: float) -> None:
+        x = float(x)
+        if self._n == self.maxlen:
+            # slide: replace the evicted value in place
+            old = float(self._buf[self._head])
+            delta = x - old
+            new_mean = self._mean + delta / self._n
+            self._m2 += delta * (x - new_mean + old - self._mean)
+            self._mean = new_mean
+        else:
+            delta = x - self._mean
+            self._mean += delta / (self._n + 1)
+            self._m2 += delta * (x - self._mean)
+        super().append(x)
+        if self._head == 0:
+            self._resync()
+
+    def extend(self, xs: np.ndarray) -> None:
+        k = len(xs)
+        if not k:
+            return
+        if self._head + k >= self.maxlen:
+            super().extend(xs)
+            self._resync()
+            return
+
+        n = self._n
+        evict = max(0, n + k - self.maxlen)
+        if evict:
+            # the oldest `evict` values sit contiguously at the write head (no wrap here)
+            gone = self._buf[self._head:self._head + evict]
+            g_mean = float(gone.mean())
+            g_m2 = float(((gone - g_mean) ** 2).sum())
+            n_keep = n - evict
+            keep_mean = (n * self._mean - evict * g_mean) / n_keep
+            self._m2 -= g_m2 + (g_mean - keep_mean) ** 2 * n_keep * evict / n
+            self._mean = keep_mean
+            n = n_keep
+
+        x_mean = float(xs.mean())
+        x_m2 = float(((xs - x_mean) ** 2).sum())
+        total = n + k
+        delta = x_mean - self._mean
+        self._mean += delta * k / total
+        self._m2 = max(0.0, self._m2 + x_m2 + delta * delta * n * k / total)
+        super().extend(xs)
+
+    def _resync(self) -> None:
+        mu, sd = mean_std(self.values())
+        self._mean = mu
+        self._m2 = sd * sd * (self._n - 1) if self._n > 1 else 0.0
 
-    def values(self) -> List[T]:
-        return list(self.buf)
+    def mean(self) -> float:
+        return self._mean if self._n else 0.0
 
-    def last(self) -> T | None:
-        return self.buf[-1] if self.buf else None
+    def stdev(self) -> float:
+        """Sample standard deviation (n - 1), 0.0 below two values, like utils.stats.stdev."""
+        if self._n < 2:
+            return 0.0
+        return math.sqrt(max(self._m2 / (self._n - 1), 0.0))
@@ -1,6 +1,13 @@
 from __future__ import annotations
 import math
-from typing import Iterable, Optional
+from typing import Iterable, Optional, Tuple
+
+import numpy as np
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional
+    njit = None
 
 
 def mean(xs: Iterable[float]) -> float:
@@ -18,6 +25,39 @@ def stdev(xs: Iterable[float]) -> float:
     return math.sqrt(max(var, 0.0))
 
 
+def mean_std(x: np.ndarray) -> Tuple[float, float]:
+    """Mean and sample stdev (n - 1) of a float64 array; same edge cases as mean()/stdev()."""
+    n = x.shape[0]
+    if n == 0:
+        return 0.0, 0.0
+    if n < 2:
+        return float(x[0]), 0.0
+    return float(x.mean()), float(x.std(ddof=1))
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _mean_std_nb(x):
+        # one Welford pass for both moments
+        m = 0.0
+        m2 = 0.0
+        for i in range(x.shape[0]):
+            d = x[i] - m
+            m += d / (i + 1)
+            m2 += d * (x[i] - m)
+        return m, m2
+
+    def mean_std(x: np.ndarray) -> Tuple[float, float]:  # noqa: F811
+        """Mean and sample stdev (n - 1) of a float64 array; same edge cases as mean()/stdev()."""
+        n = x.shape[0]
+        if n == 0:
+            return 0.0, 0.0
+        m, m2 = _mean_std_nb(x)
+        if n < 2:
+            return m, 0.0
+        return m, math.sqrt(max(m2 / (n - 1), 0.0))
+
+
 def zscore(x: float, mu: float, sd: float, eps: float = 1e-12) -> float:
     return (x - mu) / max(sd, eps)
 
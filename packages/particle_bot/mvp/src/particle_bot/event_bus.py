@@ -1,16 +1,18 @@
 from __future__ import annotations
-from typing import Callable, Dict, List, Type
+from typing import Callable, Dict, Tuple
 from particle_bot.types import BaseEvent, EventType
 
 Handler = Callable[[BaseEvent], None]
 
 class EventBus:
     def __init__(self) -> None:
-        self._subs: Dict[EventType, List[Handler]] = {}
+        # one slot per known EventType, pre-filled so publish is a plain lookup with no default;
+        # handler tuples are rebuilt on (rare) subscribe so publish iterates an immutable tuple
+        self._subs: Dict[EventType, Tuple[Handler, ...]] = {et: () for et in EventType}
 
     def subscribe(self, etype: EventType, handler: Handler) -> None:
-        self._subs.setdefault(etype, []).append(handler)
+        self._subs[etype] += (handler,)
 
     def publish(self, ev: BaseEvent) -> None:
-        for h in self._subs.get(ev.etype, []):
+        for h in self._subs[ev.etype]:
             h(ev)
@@ -4,7 +4,10 @@ from typing import Dict, Any, DefaultDict
 from collections import defaultdict
 import numpy as np
 
-from particle_bot.types import BaseEvent, TradePrint, BookDelta, FundingTick, OITick, BasisTick, EventType, TradeSide, Symbol
+from particle_bot.types import (
+    BaseEvent, TradePrint, TradePrintFast, BookDelta, BookDeltaFast, FundingTick, OITick, BasisTick,
+    EventType, TradeSide, Symbol,
+)
 from particle_bot.scales import Scale, DEFAULT_SCALES
 from particle_bot.utils.ringbuffer import RingBuffer
 from particle_bot.utils.stats import mean, stdev, zscore, clamp
@@ -73,7 +76,7 @@ class MVPFeatureEngine:
         elif ev.etype == EventType.BASIS_TICK:
             self._update_basis(ev)     # type: ignore[arg-type]
 
-    def _update_trade(self, t: TradePrint) -> None:
+    def _update_trade(self, t: TradePrint | TradePrintFast) -> None:
         self.trade_count[t.symbol] += 1
         sign = 0.0
         if t.side == TradeSide.BUY:
@@ -94,11 +97,13 @@ class MVPFeatureEngine:
             st.signed_sizes.append(sign * t.size)
             st.cvd += sign * t.size
 
-    def _update_book(self, b: BookDelta) -> None:
+    def _update_book(self, b: BookDelta | BookDeltaFast) -> None:
         # store last snapshot; features derived in snapshot()
+        # (BookDeltaFast levels are already (price, size) tuples)
+        fast = isinstance(b, BookDeltaFast)
         self.last_book[b.symbol] = {
-            "bids": [(lvl.price, lvl.size) for lvl in b.bids],
-            "asks": [(lvl.price, lvl.size) for lvl in b.asks],
+            "bids": b.bids if fast else [(lvl.price, lvl.size) for lvl in b.bids],
+            "asks": b.asks if fast else [(lvl.price, lvl.size) for lvl in b.asks],
             "depth_n": b.depth_n,
         }
 
@@ -118,9 +123,65 @@ class MVPFeatureEngine:
         d.basis_hist.append(d.basis)
 
     def snapshot(self, symbol: Symbol, scale: Scale) -> Dict[str, Any]:
-        st = self._get_scale_state(symbol, scale)
+        return self.snapshot_all(symbol, [scale])[scale.name]
+
+    def snapshot_all(self, symbol: Symbol, scales: list[Scale] | None = None) -> Dict[str, Dict[str, Any]]:
+        """Snapshots for several scales, keyed by scale name.
+
+        Derivatives z-scores/percentiles and book imbalance don't depend on the scale,
+        so they are computed once and shared.
+        """
+        shared = self._shared_features(symbol)
+        return {
+            sc.name: self._scale_snapshot(self._get_scale_state(symbol, sc), sc, shared)
+            for sc in (scales or self.scales)
+        }
+
+    def _shared_features(self, symbol: Symbol) -> Dict[str, Any]:
         d = self._get_deriv_state(symbol)
 
+        # derivatives z-scores
+        funding_mu, funding_sd = mean(d.funding_hist.values()), stdev(d.funding_hist.values())
+        funding_z = float(zscore(d.funding, funding_mu, funding_sd))
+
+        oi_mu, oi_sd = mean(d.oi_hist.values()), stdev(d.oi_hist.values())
+        oi_z = float(zscore(d.oi, oi_mu, oi_sd))
+
+        basis_mu, basis_sd = mean(d.basis_hist.values()), stdev(d.basis_hist.values())
+        basis_z = float(zscore(d.basis, basis_mu, basis_sd))
+
+        # basis percentile (rough)
+        basis_vals = d.basis_hist.values()
+        basis_percentile = 0.5
+        if basis_vals:
+            s = sorted(basis_vals)
+            idx = np.searchsorted(s, d.basis, side="right")
+            basis_percentile = float(idx / len(s))
+
+        # squeeze score (very rough): crowded + near thin book (computed in fields later)
+        squeeze_score = float(clamp((abs(funding_z) + max(0.0, oi_z)) / 4.0, 0.0, 1.0))
+
+        # book imbalance (if available)
+        book = self.last_book.get(symbol)
+        book_imbalance = 0.0
+        if book:
+            bid_depth = sum(sz for _, sz in book["bids"][:10])
+            ask_depth = sum(sz for _, sz in book["asks"][:10])
+            book_imbalance = float((bid_depth - ask_depth) / (bid_depth + ask_depth + 1e-9))
+
+        return {
+            "funding": d.funding,
+            "funding_z": funding_z,
+            "oi": d.oi,
+            "oi_z": oi_z,
+            "basis": d.basis,
+            "basis_z": basis_z,
+            "basis_percentile": basis_percentile,
+            "squeeze_score": squeeze_score,
+            "book_imbalance": book_imbalance,
+        }
+
+    def _scale_snapshot(self, st: ScaleState, scale: Scale, shared: Dict[str, Any]) -> Dict[str, Any]:
         prices = st.prices.values()
         rets = st.rets.values()
         sizes = st.sizes.values()
@@ -187,26 +248,7 @@ class MVPFeatureEngine:
             vol_percentile = float(idx / len(vol_hist_sorted))
         breakout_prob = float(clamp((1.0 - vol_percentile) * directional_strength, 0.0, 1.0))
 
-        # derivatives z-scores
-        funding_mu, funding_sd = mean(d.funding_hist.values()), stdev(d.funding_hist.values())
-        funding_z = float(zscore(d.funding, funding_mu, funding_sd))
-
-        oi_mu, oi_sd = mean(d.oi_hist.values()), stdev(d.oi_hist.values())
-        oi_z = float(zscore(d.oi, oi_mu, oi_sd))
-
-        basis_mu, basis_sd = mean(d.basis_hist.values()), stdev(d.basis_hist.values())
-        basis_z = float(zscore(d.basis, basis_mu, basis_sd))
-
-        # basis percentile (rough)
-        basis_vals = d.basis_hist.values()
-        basis_percentile = 0.5
-        if basis_vals:
-            s = sorted(basis_vals)
-            idx = np.searchsorted(s, d.basis, side="right")
-            basis_percentile = float(idx / len(s))
-
-        # squeeze score (very rough): crowded + near thin book (computed in fields later)
-        squeeze_score = float(clamp((abs(funding_z) + max(0.0, oi_z)) / 4.0, 0.0, 1.0))
+        oi_z = shared["oi_z"]
 
         # deleveraging score: oi drop z + high tail risk
         deleveraging_score = float(clamp(max(0.0, -oi_z) * 0.5 + tail_risk, 0.0, 1.0))
@@ -216,15 +258,6 @@ class MVPFeatureEngine:
         exhaustion_score = float(clamp((1.0 - directional_strength) * tail_risk, 0.0, 1.0))
         stoprun_score = float(clamp(tail_risk * vol_mult, 0.0, 1.0))
 
-        # book imbalance (if available)
-        book = self.last_book.get(symbol)
-        book_imbalance = 0.0
-        mid = prices[-1] if prices else 0.0
-        if book:
-            bid_depth = sum(sz for _, sz in book["bids"][:10])
-            ask_depth = sum(sz for _, sz in book["asks"][:10])
-            book_imbalance = float((bid_depth - ask_depth) / (bid_depth + ask_depth + 1e-9))
-
         return {
             "scale": scale.name,
             "n_trades": len(prices),
@@ -238,17 +271,17 @@ class MVPFeatureEngine:
             "cvd_slope": cvd_slope,
             "progress_sigma": progress_sigma,
             "vol_mult": vol_mult,
-            "funding": d.funding,
-            "funding_z": funding_z,
-            "oi": d.oi,
+            "funding": shared["funding"],
+            "funding_z": shared["funding_z"],
+            "oi": shared["oi"],
             "oi_z": oi_z,
-            "basis": d.basis,
-            "basis_z": basis_z,
-            "basis_percentile": basis_percentile,
-            "squeeze_score": squeeze_score,
+            "basis": shared["basis"],
+            "basis_z": shared["basis_z"],
+            "basis_percentile": shared["basis_percentile"],
+            "squeeze_score": shared["squeeze_score"],
             "deleveraging_score": deleveraging_score,
             "impulse_score": impulse_score,
             "exhaustion_score": exhaustion_score,
             "stoprun_score": stoprun_score,
-            "book_imbalance": book_imbalance,
+            "book_imbalance": shared["book_imbalance"],
         }
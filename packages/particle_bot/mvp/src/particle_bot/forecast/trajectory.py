@@ -1,6 +1,35 @@
 from __future__ import annotations
 import numpy as np
-from typing import Dict, Any
+from typing import Dict, Any, Optional
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; simulate_paths falls back to the NumPy loop
+    njit = None
+
+if njit is not None:
+    @njit(parallel=True, fastmath=True, cache=True)
+    def _simulate_paths_nb(p0, v0, g0, inv_dp, gradU, drift, alpha, beta, sigma, noise, P):
+        # paths are independent: each thread carries one path's (p, v) through all steps
+        steps, n_paths = noise.shape
+        xmax = gradU.shape[0] - 1.0
+        gmax = gradU.shape[0] - 2
+        for j in prange(n_paths):
+            p = p0
+            v = v0
+            P[j, 0] = p
+            for k in range(steps):
+                # linear interp of gradU on the uniform grid, clamped at the ends like np.interp
+                x = (p - g0) * inv_dp
+                if x < 0.0:
+                    x = 0.0
+                elif x > xmax:
+                    x = xmax
+                i = min(int(x), gmax)
+                gr = gradU[i] + (x - i) * (gradU[i + 1] - gradU[i])
+                v = alpha * v - beta * gr + drift + sigma * noise[k, j]
+                p += v
+                P[j, k + 1] = p
 
 def simulate_paths(
     p0: float,
@@ -15,21 +44,37 @@ def simulate_paths(
     steps: int = 250,
     n_paths: int = 2000,
     seed: int = 7,
+    rng: Optional[np.random.Generator] = None,
 ) -> np.ndarray:
-    rng = np.random.default_rng(seed)
+    """Monte Carlo price paths, shape (n_paths, steps + 1).
+
+    Pass a long-lived `rng` to draw fresh paths on every call; otherwise a generator
+    is seeded from `seed` (identical paths for identical inputs).
+    """
+    if rng is None:
+        rng = np.random.default_rng(seed)
     gradU = np.gradient(U, grid)
 
+    # all noise drawn up front as float32 standard normals (half the buffer), scaled by
+    # sigma in float64 as it is consumed
+    noise = rng.standard_normal((steps, n_paths), dtype=np.float32)
+
+    P = np.empty((n_paths, steps + 1), dtype=float)
+    if njit is not None:
+        # grid comes from build_price_grid (np.linspace), so it is uniform
+        inv_dp = 1.0 / float(grid[1] - grid[0])
+        _simulate_paths_nb(float(p0), float(v0), float(grid[0]), inv_dp, gradU,
+                           gamma * F_flow, float(alpha), float(beta), float(sigma_local), noise, P)
+        return P
+
     def g(p):
         return np.interp(p, grid, gradU)
 
-    P = np.zeros((n_paths, steps + 1), dtype=float)
-    V = np.zeros((n_paths,), dtype=float)
+    V = np.full((n_paths,), v0, dtype=float)
     P[:, 0] = p0
-    V[:] = v0
 
     for k in range(steps):
-        eps = rng.normal(0.0, sigma_local, size=n_paths)
-        V = alpha * V - beta * g(P[:, k]) + gamma * F_flow + eps
+        V = alpha * V - beta * g(P[:, k]) + gamma * F_flow + sigma_local * noise[k]
         P[:, k + 1] = P[:, k] + V
 
     return P
@@ -1,22 +1,29 @@
 from __future__ import annotations
 import argparse
-import json
 from pathlib import Path
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Tuple
+import orjson
 import yaml
 import numpy as np
 
-from particle_bot.types import Symbol, EventType, BaseEvent, TradePrint
+from particle_bot.types import Symbol, EventType, BaseEvent, TradePrintFast
 from particle_bot.scales import Scale, DEFAULT_SCALES
 from particle_bot.event_bus import EventBus
 from particle_bot.mock_feed import synthetic_event_stream
 from particle_bot.features.mvp import MVPFeatureEngine
 from particle_bot.regimes.stacker import build_regime_stack
+from particle_bot.regimes.taxonomy import LEGEND, RegimeCode
 from particle_bot.fields.liquidity import build_price_grid, liquidity_potential
 from particle_bot.fields.positioning import positioning_potential
 from particle_bot.fields.total import total_potential
 from particle_bot.forecast.trajectory import simulate_paths, cone_summary
 
+# regime-conditioned coefficient lookups, built once
+_TREND_KINGDOMS = frozenset({RegimeCode.TREND, RegimeCode.BREAKOUT})
+_CROWDED_CLASSES = frozenset({RegimeCode.CROWDED_LONG, RegimeCode.CROWDED_SHORT, RegimeCode.SQUEEZE_SETUP})
+_FIELD_WEIGHTS = {"liq": 1.0, "pos": 1.0}
+SIGMA_FLOOR = 1e-6
+
 
 def load_config(path: str | None) -> Dict[str, Any]:
     if not path:
@@ -39,6 +46,16 @@ def parse_scales(cfg: Dict[str, Any]) -> List[Scale]:
     return scales
 
 
+def _build_potentials(
+    p0: float, sigma_local: float, book: Dict[str, Any] | None, f: Dict[str, Any]
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Price grid and total potential (liquidity + positioning) around p0."""
+    grid = build_price_grid(p0, sigma_local)
+    U_liq = liquidity_potential(grid, book, p0)
+    U_pos = positioning_potential(grid, f, p0, sigma_local)
+    return grid, total_potential({"liq": U_liq, "pos": U_pos}, weights=_FIELD_WEIGHTS)
+
+
 def main() -> None:
     ap = argparse.ArgumentParser()
     ap.add_argument("--mode", choices=["replay"], default="replay")
@@ -46,7 +63,7 @@ def main() -> None:
     ap.add_argument("--steps", type=int, default=5000)
     ap.add_argument("--seed", type=int, default=7)
     ap.add_argument("--config", type=str, default=None)
-    ap.add_argument("--out", type=str, default="data/derived/out.json")
+    ap.add_argument("--out", type=str, default="data/derived/out.jsonl")
     args = ap.parse_args()
 
     cfg = load_config(args.config) if args.config else load_config("config/default.yaml") if Path("config/default.yaml").exists() else {}
@@ -65,13 +82,30 @@ def main() -> None:
     for et in [EventType.TRADE_PRINT, EventType.BOOK_DELTA, EventType.FUNDING_TICK, EventType.OI_TICK, EventType.BASIS_TICK]:
         bus.subscribe(et, feat.update)
 
-    outputs: List[Dict[str, Any]] = []
+    # snapshots are streamed as JSONL, one line each, instead of collected and dumped at the end
+    out_path = Path(args.out)
+    out_path.parent.mkdir(parents=True, exist_ok=True)
+    out_f = out_path.open("wb")
+    # regimes are written as integer codes; the first line carries the legend to decode them
+    out_f.write(orjson.dumps({"legend": LEGEND}))
+    out_f.write(b"\n")
+    n_written = 0
+
+    # reused across snapshots: each snapshot line is serialized before the next one starts
+    scale_snaps: List[Dict[str, Any]] = []
+
+    # one generator for the whole run: each snapshot's cone gets fresh paths, and the
+    # sequence is still reproducible from --seed
+    rng = np.random.default_rng(args.seed)
+
+    # (p0, sigma_local) -> (grid, U), valid for one snapshot (book and funding/OI are fixed within it)
+    pot_cache: Dict[Tuple[float, float], Tuple[np.ndarray, np.ndarray]] = {}
 
     trade_counter = {"n": 0}
-    last_trade: TradePrint | None = None
+    last_trade: TradePrintFast | None = None
 
     def on_trade(ev: BaseEvent) -> None:
-        nonlocal last_trade
+        nonlocal last_trade, n_written
         t = ev  # type: ignore[assignment]
         last_trade = t  # type: ignore[assignment]
         trade_counter["n"] += 1
@@ -80,28 +114,34 @@ def main() -> None:
             return
 
         # build outputs for each scale
-        scale_snaps = []
+        scale_snaps.clear()
+        pot_cache.clear()
+        # scale-invariant inputs are looked up once per snapshot
+        snaps = feat.snapshot_all(symbol, scales)
+        book = feat.last_book.get(symbol)
         for sc in scales:
-            f = feat.snapshot(symbol, sc)
+            f = snaps[sc.name]
             reg = build_regime_stack(f)
 
             # fields + cone only if we have price
             p0 = f.get("last_price")
             sigma_local = f.get("ret_sd", 0.0)
-            book = feat.last_book.get(symbol)
 
             if p0 is not None and sigma_local is not None:
-                grid = build_price_grid(float(p0), float(sigma_local))
-                U_liq = liquidity_potential(grid, book, float(p0))
-                U_pos = positioning_potential(grid, f, float(p0), float(sigma_local))
-                U = total_potential({"liq": U_liq, "pos": U_pos}, weights={"liq": 1.0, "pos": 1.0})
+                # the potential only varies by scale through sigma_local; scales whose
+                # windows haven't diverged yet share one build
+                key = (float(p0), float(sigma_local))
+                pot = pot_cache.get(key)
+                if pot is None:
+                    pot = pot_cache[key] = _build_potentials(key[0], key[1], book, f)
+                grid, U = pot
 
                 # Flow force proxy: use cvd_slope scaled down
                 F_flow = float(np.tanh(f.get("cvd_slope", 0.0) / 50.0))
 
                 # regime-conditioned coefficients (simple)
-                alpha = 0.90 if reg.kingdom in ("trend","breakout") else 0.80
-                beta = 0.15 if reg.clazz in ("crowded_long","crowded_short","squeeze_setup") else 0.10
+                alpha = 0.90 if reg.kingdom_code in _TREND_KINGDOMS else 0.80
+                beta = 0.15 if reg.clazz_code in _CROWDED_CLASSES else 0.10
                 gamma = 0.25
 
                 paths = simulate_paths(
@@ -110,13 +150,13 @@ def main() -> None:
                     grid=grid,
                     U=U,
                     F_flow=F_flow,
-                    sigma_local=max(float(sigma_local), 1e-6),
+                    sigma_local=max(float(sigma_local), SIGMA_FLOOR),
                     alpha=float(alpha),
                     beta=float(beta),
                     gamma=float(gamma),
                     steps=cone_steps,
                     n_paths=n_paths,
-                    seed=args.seed,
+                    rng=rng,
                 )
                 cone = cone_summary(paths)
             else:
@@ -125,28 +165,31 @@ def main() -> None:
             scale_snaps.append({
                 "scale": sc.name,
                 "features": f,
-                "regimes": reg.model_dump(),
+                "regimes": reg.to_codes(),
+                "probs": reg.probs,
+                "stability": reg.stability,
                 "cone": cone,
             })
 
-        outputs.append({
-            "ts": ev.ts.isoformat(),
+        # orjson writes datetimes as RFC 3339 and numpy scalars natively
+        out_f.write(orjson.dumps({
+            "ts": ev.ts,
             "symbol": symbol.value,
             "snapshots": scale_snaps,
-        })
+        }, option=orjson.OPT_SERIALIZE_NUMPY))
+        out_f.write(b"\n")
+        n_written += 1
 
     bus.subscribe(EventType.TRADE_PRINT, on_trade)
 
     # run replay using synthetic feed
     stream = synthetic_event_stream(symbol=symbol, steps=args.steps, seed=args.seed)
-    for ev in stream:
-        bus.publish(ev)  # type: ignore[arg-type]
-
-    out_path = Path(args.out)
-    out_path.parent.mkdir(parents=True, exist_ok=True)
-    out_path.write_text(json.dumps(outputs, indent=2), encoding="utf-8")
+    publish = bus.publish
+    with out_f:
+        for ev in stream:
+            publish(ev)  # type: ignore[arg-type]
 
-    print(f"Wrote {len(outputs)} snapshots to {out_path}")
+    print(f"Wrote {n_written} snapshots to {out_path}")
 
 if __name__ == "__main__":
     main()
@@ -1,11 +1,12 @@
 from __future__ import annotations
 import math
-import random
 from datetime import datetime, timedelta, timezone
 from typing import Iterator, Optional
 
+import numpy as np
+
 from particle_bot.types import (
-    Symbol, Venue, TradePrint, BookDelta, BookLevel, FundingTick, OITick, BasisTick,
+    Symbol, Venue, TradePrintFast, BookDeltaFast, FundingTick, OITick, BasisTick,
     EventType, TradeSide
 )
 
@@ -26,68 +27,74 @@ def synthetic_event_stream(
     - occasional funding/OI/basis
     This is for MVP validation + replay determinism.
     """
-    rng = random.Random(seed)
-    ts = _now()
-    p = start_price
-    v = 0.0
+    rng = np.random.default_rng(seed)
 
-    # latent regime switches create trend/range/vol clusters
+    # latent regime switches create trend/range/vol clusters. The regime schedule is a
+    # state machine over segments, so lay it out first and derive per-step drift/sigma
+    # from lookup tables; every other noise source is then drawn in one batch.
     regimes = ["range", "trend_up", "trend_down", "chop_highvol"]
-    regime = "range"
-    regime_ttl = 500
+    drift_by_regime = np.array([0.0, 0.9, -0.9, 0.0])
+    sigma_by_regime = np.array([8.0, 10.0, 10.0, 18.0])
+    regime_idx = np.empty(steps, dtype=np.int64)
+    pos, cur, ttl = 0, 0, 500
+    while pos < steps:
+        regime_idx[pos:pos + ttl] = cur
+        pos += ttl
+        cur = int(rng.choice(4, p=[0.45, 0.2, 0.2, 0.15]))
+        ttl = int(rng.integers(300, 1201))
+    drift_arr = drift_by_regime[regime_idx]
+    sigma_arr = sigma_by_regime[regime_idx]
+
+    eps_arr = rng.standard_normal(steps) * sigma_arr
+    # size correlates with volatility
+    size_arr = np.maximum(0.001, np.abs(0.25 + 0.18 * rng.standard_normal(steps)) * (1.0 + sigma_arr / 20.0))
+    side_draw = rng.integers(0, 3, size=steps)
+    jitter_ms = rng.integers(1, 16, size=steps)
+    book_sizes = np.maximum(0.1, rng.random((steps // 20 + 1, 2, 20)) * 5)
+    slow_noise = rng.standard_normal((steps // 100 + 1, 3))
+    slow_unif = rng.random(steps // 100 + 1)
+    random_sides = (TradeSide.BUY, TradeSide.SELL, TradeSide.UNKNOWN)
+    level_steps = np.arange(1, 21, dtype=float)
+
+    # timestamps on a fixed 200ms print clock; recv jitter from a small timedelta table
+    t0 = _now()
+    ts_arr = [t0 + timedelta(milliseconds=200 * (i + 1)) for i in range(steps)]
+    jitter_td = [timedelta(milliseconds=k) for k in range(16)]
+
+    p = start_price
+    v = 0.0
 
     funding = 0.0001
     oi = 1_000_000.0
     basis = 5.0
 
     for i in range(steps):
-        if regime_ttl <= 0:
-            regime = rng.choices(regimes, weights=[0.45, 0.2, 0.2, 0.15])[0]
-            regime_ttl = rng.randint(300, 1200)
-
-        regime_ttl -= 1
-
-        # noise level changes by regime
-        if regime == "range":
-            drift = 0.0
-            sigma = 8.0
-        elif regime == "trend_up":
-            drift = 0.9
-            sigma = 10.0
-        elif regime == "trend_down":
-            drift = -0.9
-            sigma = 10.0
-        else:  # chop_highvol
-            drift = 0.0
-            sigma = 18.0
+        regime = regimes[regime_idx[i]]
+        sigma = float(sigma_arr[i])
 
         # simple particle motion
-        eps = rng.gauss(0.0, sigma)
-        v = 0.90 * v + drift + eps
+        v = 0.90 * v + float(drift_arr[i]) + float(eps_arr[i])
         p = max(1.0, p + v)
 
-        # size correlates with volatility
-        size = max(0.001, abs(rng.gauss(0.25, 0.18)) * (1.0 + sigma/20.0))
-
         # aggressor side correlates with velocity sign (weakly)
         if v > 2.0:
             side = TradeSide.BUY
         elif v < -2.0:
             side = TradeSide.SELL
         else:
-            side = rng.choice([TradeSide.BUY, TradeSide.SELL, TradeSide.UNKNOWN])
+            side = random_sides[side_draw[i]]
 
-        ts = ts + timedelta(milliseconds=200)
-        recv_ts = ts + timedelta(milliseconds=rng.randint(1, 15))
+        ts = ts_arr[i]
+        recv_ts = ts + jitter_td[jitter_ms[i]]
 
-        yield TradePrint(
+        # prints and books are the high-rate types: slotted dataclasses, no per-event validation
+        yield TradePrintFast(
             ts=ts,
             recv_ts=recv_ts,
             symbol=symbol,
             venue=Venue.MOCK,
-            etype=EventType.TRADE_PRINT,
             price=float(p),
-            size=float(size),
+            size=float(size_arr[i]),
             side=side,
             meta={"regime_hint": regime},
         )
@@ -95,18 +102,15 @@ def synthetic_event_stream(
         # every ~20 prints, emit a simple L1 book snapshot
         if i % 20 == 0:
             spread = max(0.5, 0.02 * sigma)
-            bids = []
-            asks = []
-            for lvl in range(20):
-                dp = (lvl + 1) * spread
-                bids.append(BookLevel(price=float(p - dp), size=float(max(0.1, rng.random()*5))))
-                asks.append(BookLevel(price=float(p + dp), size=float(max(0.1, rng.random()*5))))
-            yield BookDelta(
+            dp = (level_steps * spread).tolist()
+            bsz, asz = book_sizes[i // 20].tolist()
+            bids = [(p - d, sz) for d, sz in zip(dp, bsz)]
+            asks = [(p + d, sz) for d, sz in zip(dp, asz)]
+            yield BookDeltaFast(
                 ts=ts,
                 recv_ts=recv_ts,
                 symbol=symbol,
                 venue=Venue.MOCK,
-                etype=EventType.BOOK_DELTA,
                 bids=bids,
                 asks=asks,
                 depth_n=20,
@@ -115,16 +119,17 @@ def synthetic_event_stream(
 
         # every ~100 prints, emit funding/OI/basis dynamics
         if i % 100 == 0:
+            z_funding, z_oi, z_basis = slow_noise[i // 100].tolist()
             # funding drifts positive in trend_up, negative in trend_down
-            funding += (0.00002 if regime == "trend_up" else -0.00002 if regime == "trend_down" else 0.0) + rng.gauss(0.0, 0.00003)
+            funding += (0.00002 if regime == "trend_up" else -0.00002 if regime == "trend_down" else 0.0) + 0.00003 * z_funding
             funding = max(-0.003, min(0.003, funding))
 
             # oi increases in trends, collapses sometimes in chop
-            oi += (5000 if regime in ("trend_up", "trend_down") else 1000) + rng.gauss(0, 3000)
-            if regime == "chop_highvol" and rng.random() < 0.03:
+            oi += (5000 if regime in ("trend_up", "trend_down") else 1000) + 3000 * z_oi
+            if regime == "chop_highvol" and slow_unif[i // 100] < 0.03:
                 oi *= 0.95  # deleveraging pulse
 
-            basis += (0.15 if funding > 0 else -0.15) + rng.gauss(0, 0.25)
+            basis += (0.15 if funding > 0 else -0.15) + 0.25 * z_basis
 
             yield FundingTick(
                 ts=ts,
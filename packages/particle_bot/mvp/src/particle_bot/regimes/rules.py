@@ -1,7 +1,14 @@
 from __future__ import annotations
-from dataclasses import dataclass
+from dataclasses import astuple, dataclass
 from typing import Dict, Any, Tuple
-from particle_bot.utils.stats import clamp
+import numpy as np
+
+from particle_bot.regimes.taxonomy import LABELS, RegimeCode
+
+try:
+    from numba import njit
+except ImportError:  # numba is optional
+    njit = None
 
 @dataclass
 class Thresholds:
@@ -16,77 +23,165 @@ class Thresholds:
 
 T = Thresholds()
 
-def kingdom(f: Dict[str, Any]) -> Tuple[str, float]:
-    dir_strength = f.get("directional_strength", 0.0)
-    mr_score = f.get("mean_reversion_score", 0.0)
-    tail_risk = f.get("tail_risk", 0.0)
-    breakout_prob = f.get("breakout_prob", 0.0)
+# Canonical feature order for the rule kernel, with the defaults used for missing keys.
+FEATURES = (
+    "directional_strength", "mean_reversion_score", "tail_risk", "breakout_prob",
+    "vol_percentile", "basis_z", "funding_z", "oi_z", "basis_percentile",
+    "deleveraging_score", "squeeze_score", "vol_mult", "progress_sigma",
+    "impulse_score", "exhaustion_score", "stoprun_score",
+)
+FIDX = {name: i for i, name in enumerate(FEATURES)}
+_DEFAULTS = {"vol_percentile": 0.5, "basis_percentile": 0.5, "vol_mult": 1.0}
+
+(_DIR, _MR, _TAIL, _BRK, _VOLP, _BZ, _FZ, _OIZ, _BASP,
+ _DELEV, _SQZ, _VMULT, _PROG, _IMP, _EXH, _STOP) = range(len(FEATURES))
+(_T_TREND, _T_MR, _T_COMP, _T_EXP, _T_FZ, _T_OIZ, _T_ABS_VM, _T_ABS_PS) = range(8)
+
+# plain ints so the kernel sees compile-time constants
+_RISK_ON, _UNIV_NEUTRAL, _RISK_OFF = int(RegimeCode.RISK_ON), int(RegimeCode.UNIVERSE_NEUTRAL), int(RegimeCode.RISK_OFF)
+_KINGDOM0 = int(RegimeCode.CRASH_OR_MELT)
+_PHYLUM0 = int(RegimeCode.COMPRESSION)
+_CLAZZ0 = int(RegimeCode.DELEVERAGING)
+_FAMILY0 = int(RegimeCode.STOP_RUN)
+_ORDER = int(RegimeCode.LIQUIDITY_TOPOLOGY_PENDING)
+_GENUS = int(RegimeCode.SETUP_PENDING)
+_SPECIES = int(RegimeCode.EXECUTION_PENDING)
+
+def feature_vector(f: Dict[str, Any]) -> np.ndarray:
+    """Snapshot dict -> float64[:] in FEATURES order."""
+    return np.array([f.get(name, _DEFAULTS.get(name, 0.0)) for name in FEATURES], dtype=np.float64)
+
+def _clamp(x, lo, hi):
+    # same comparisons as utils.stats.clamp (max(lo, min(hi, x))), including for nan
+    y = x if x < hi else hi
+    return y if y > lo else lo
+
+def _universe(x):
+    # MVP: infer from funding+vol; replace with macro later
+    if x[_TAIL] > 0.7 and x[_VOLP] > 0.75:
+        return _RISK_OFF
+    if x[_FZ] > 0.25 and x[_VOLP] < 0.75:
+        return _RISK_ON
+    return _UNIV_NEUTRAL
+
+def _kingdom(x, t):
+    dir_strength = x[_DIR]
+    mr_score = x[_MR]
+    tail_risk = x[_TAIL]
+    breakout_prob = x[_BRK]
 
     if tail_risk > 0.8 and dir_strength > 0.7:
-        return ("crash_or_melt", clamp(0.5 + 0.5 * tail_risk, 0, 1))
-
+        return 0, _clamp(0.5 + 0.5 * tail_risk, 0.0, 1.0)
     if breakout_prob > 0.75:
-        return ("breakout", breakout_prob)
-
-    if dir_strength > T.trend_strength and mr_score < 0.45:
-        return ("trend", clamp(dir_strength, 0, 1))
-
-    if mr_score > T.mr_strength and dir_strength < 0.55:
-        return ("mean_revert", clamp(mr_score, 0, 1))
-
-    return ("range", 0.55)
-
-def phylum(f: Dict[str, Any]) -> Tuple[str, float]:
-    vol_pct = f.get("vol_percentile", 0.5)
-    vov = min(1.0, f.get("tail_risk", 0.0) + max(0.0, f.get("basis_z", 0.0)) * 0.1)
-
-    if vol_pct < T.compression_pct and vov < 0.35:
-        return ("compression", clamp(1.0 - vol_pct, 0, 1))
-    if vol_pct > T.expansion_pct or vov > 0.7:
-        return ("expansion", clamp(vol_pct, 0, 1))
+        return 1, breakout_prob
+    if dir_strength > t[_T_TREND] and mr_score < 0.45:
+        return 2, _clamp(dir_strength, 0.0, 1.0)
+    if mr_score > t[_T_MR] and dir_strength < 0.55:
+        return 3, _clamp(mr_score, 0.0, 1.0)
+    return 4, 0.55
+
+def _phylum(x, t):
+    vol_pct = x[_VOLP]
+    vov = min(1.0, x[_TAIL] + max(0.0, x[_BZ]) * 0.1)
+
+    if vol_pct < t[_T_COMP] and vov < 0.35:
+        return 0, _clamp(1.0 - vol_pct, 0.0, 1.0)
+    if vol_pct > t[_T_EXP] or vov > 0.7:
+        return 1, _clamp(vol_pct, 0.0, 1.0)
     if vol_pct > 0.6:
-        return ("elevated", vol_pct)
-    return ("decay", 0.55)
+        return 2, vol_pct
+    return 3, 0.55
 
-def clazz(f: Dict[str, Any]) -> Tuple[str, float]:
-    fz = f.get("funding_z", 0.0)
-    oiz = f.get("oi_z", 0.0)
-    basis_pct = f.get("basis_percentile", 0.5)
-    deleveraging = f.get("deleveraging_score", 0.0)
+def _clazz(x, t):
+    fz = x[_FZ]
+    oiz = x[_OIZ]
+    basis_pct = x[_BASP]
+    deleveraging = x[_DELEV]
 
     if deleveraging > 0.7:
-        return ("deleveraging", deleveraging)
-
-    if fz > T.funding_z_crowded and oiz > T.oi_z_hot and basis_pct > 0.7:
-        return ("crowded_long", clamp((fz/2.0 + oiz/2.0) / 2.0, 0, 1))
-
-    if fz < -T.funding_z_crowded and oiz > T.oi_z_hot and basis_pct < 0.3:
-        return ("crowded_short", clamp((-fz/2.0 + oiz/2.0) / 2.0, 0, 1))
-
-    squeeze = f.get("squeeze_score", 0.0)
+        return 0, deleveraging
+    if fz > t[_T_FZ] and oiz > t[_T_OIZ] and basis_pct > 0.7:
+        return 1, _clamp((fz / 2.0 + oiz / 2.0) / 2.0, 0.0, 1.0)
+    if fz < -t[_T_FZ] and oiz > t[_T_OIZ] and basis_pct < 0.3:
+        return 2, _clamp((-fz / 2.0 + oiz / 2.0) / 2.0, 0.0, 1.0)
+    squeeze = x[_SQZ]
     if squeeze > 0.65:
-        return ("squeeze_setup", squeeze)
-
-    return ("balanced", 0.55)
+        return 3, squeeze
+    return 4, 0.55
 
-def family(f: Dict[str, Any]) -> Tuple[str, float]:
-    vol_mult = f.get("vol_mult", 1.0)
-    progress_sigma = f.get("progress_sigma", 0.0)
-    impulse = f.get("impulse_score", 0.0)
-    exhaustion = f.get("exhaustion_score", 0.0)
-    stoprun = f.get("stoprun_score", 0.0)
+def _family(x, t):
+    vol_mult = x[_VMULT]
+    progress_sigma = x[_PROG]
+    impulse = x[_IMP]
+    exhaustion = x[_EXH]
+    stoprun = x[_STOP]
 
     if stoprun > 0.7:
-        return ("stop_run", stoprun)
+        return 0, stoprun
+    if vol_mult > t[_T_ABS_VM] and progress_sigma < t[_T_ABS_PS]:
+        return 1, _clamp((vol_mult / 2.0) * (1.0 - progress_sigma), 0.0, 1.0)
+    if exhaustion > 0.65:
+        return 2, exhaustion
+    if impulse > 0.65:
+        return 3, impulse
+    return 4, 0.55
+
+def _classify(x, t):
+    """Full regime tree -> (codes int64[8] in LEVELS order, probs float64[4] for kingdom..family, stability)."""
+    k, kp = _kingdom(x, t)
+    p, pp = _phylum(x, t)
+    c, cp = _clazz(x, t)
+    fam, fp = _family(x, t)
+
+    codes = np.empty(8, dtype=np.int64)
+    codes[0] = _universe(x)
+    codes[1] = _KINGDOM0 + k
+    codes[2] = _PHYLUM0 + p
+    codes[3] = _CLAZZ0 + c
+    codes[4] = _ORDER
+    codes[5] = _FAMILY0 + fam
+    codes[6] = _GENUS
+    codes[7] = _SPECIES
+
+    probs = np.empty(4, dtype=np.float64)
+    probs[0] = kp
+    probs[1] = pp
+    probs[2] = cp
+    probs[3] = fp
+
+    # stability: inversely related to tail risk + near-breakout
+    stability = _clamp(1.0 - (x[_TAIL] * 0.6 + x[_BRK] * 0.4), 0.0, 1.0)
+    return codes, probs, stability
+
+if njit is not None:
+    # no fastmath: the cascade has to keep nan comparisons falling through like Python
+    _clamp = njit(cache=True, inline="always")(_clamp)
+    _universe = njit(cache=True, inline="always")(_universe)
+    _kingdom = njit(cache=True, inline="always")(_kingdom)
+    _phylum = njit(cache=True, inline="always")(_phylum)
+    _clazz = njit(cache=True, inline="always")(_clazz)
+    _family = njit(cache=True, inline="always")(_family)
+    _classify = njit(cache=True)(_classify)
+
+def thresholds_vector() -> np.ndarray:
+    return np.array(astuple(T), dtype=np.float64)
+
+def classify(x: np.ndarray, t: np.ndarray | None = None) -> Tuple[np.ndarray, np.ndarray, float]:
+    """Run the regime tree over a feature_vector(); see _classify for the layout."""
+    return _classify(x, thresholds_vector() if t is None else t)
+
+def _level(f: Dict[str, Any], i: int) -> Tuple[str, float]:
+    codes, probs, _ = classify(feature_vector(f))
+    return LABELS[int(codes[i + 1])], float(probs[i])
 
-    if vol_mult > T.absorption_vol_mult and progress_sigma < T.absorption_progress_sigma:
-        conf = clamp((vol_mult/2.0) * (1.0 - progress_sigma), 0, 1)
-        return ("absorption", conf)
+def kingdom(f: Dict[str, Any]) -> Tuple[str, float]:
+    return _level(f, 0)
 
-    if exhaustion > 0.65:
-        return ("exhaustion", exhaustion)
+def phylum(f: Dict[str, Any]) -> Tuple[str, float]:
+    return _level(f, 1)
 
-    if impulse > 0.65:
-        return ("impulse", impulse)
+def clazz(f: Dict[str, Any]) -> Tuple[str, float]:
+    return _level(f, 2)
 
-    return ("neutral", 0.55)
+def family(f: Dict[str, Any]) -> Tuple[str, float]:
+    return _level(f, 3)
@@ -1,15 +1,84 @@
 from __future__ import annotations
-from pydantic import BaseModel
-from typing import Dict
-
-class RegimeStack(BaseModel):
-    universe: str
-    kingdom: str
-    phylum: str
-    clazz: str
-    order: str
-    family: str
-    genus: str
-    species: str
+from dataclasses import dataclass
+from enum import IntEnum
+from typing import Dict, Any, Tuple
+
+LEVELS = ("universe", "kingdom", "phylum", "clazz", "order", "family", "genus", "species")
+
+class RegimeCode(IntEnum):
+    """Integer codes for every taxonomy label; the tens digit is the LEVELS index."""
+    # universe
+    RISK_ON = 0
+    UNIVERSE_NEUTRAL = 1
+    RISK_OFF = 2
+    # kingdom
+    CRASH_OR_MELT = 10
+    BREAKOUT = 11
+    TREND = 12
+    MEAN_REVERT = 13
+    RANGE = 14
+    # phylum
+    COMPRESSION = 20
+    EXPANSION = 21
+    ELEVATED = 22
+    DECAY = 23
+    # clazz
+    DELEVERAGING = 30
+    CROWDED_LONG = 31
+    CROWDED_SHORT = 32
+    SQUEEZE_SETUP = 33
+    BALANCED = 34
+    # order/genus/species: MVP placeholders
+    LIQUIDITY_TOPOLOGY_PENDING = 40
+    # family
+    STOP_RUN = 50
+    ABSORPTION = 51
+    EXHAUSTION = 52
+    IMPULSE = 53
+    NEUTRAL = 54
+    SETUP_PENDING = 60
+    EXECUTION_PENDING = 70
+
+    @property
+    def label(self) -> str:
+        return LABELS[self]
+
+# code -> label string; universe "neutral" shares its label with family "neutral"
+LABELS: Dict[int, str] = {int(c): c.name.lower() for c in RegimeCode}
+LABELS[RegimeCode.UNIVERSE_NEUTRAL] = "neutral"
+
+# decoding table for coded output: to_codes() is in LEVELS order, labels keyed by str(code)
+LEGEND: Dict[str, Any] = {
+    "levels": list(LEVELS),
+    "labels": {str(c): label for c, label in LABELS.items()},
+}
+
+def _level(i: int) -> Tuple[property, property]:
+    code = property(lambda self: self.codes[i])
+    name = property(lambda self: LABELS[self.codes[i]])
+    return code, name
+
+@dataclass(slots=True)
+class RegimeStack:
+    """Coded regime stack; labels are only looked up when read or dumped."""
+    codes: Tuple[int, ...]  # one RegimeCode per LEVELS entry
     probs: Dict[str, float]
     stability: float
+
+    universe_code, universe = _level(0)
+    kingdom_code, kingdom = _level(1)
+    phylum_code, phylum = _level(2)
+    clazz_code, clazz = _level(3)
+    order_code, order = _level(4)
+    family_code, family = _level(5)
+    genus_code, genus = _level(6)
+    species_code, species = _level(7)
+
+    def to_codes(self) -> Tuple[int, ...]:
+        return self.codes
+
+    def model_dump(self) -> Dict[str, Any]:
+        d: Dict[str, Any] = {lvl: LABELS[c] for lvl, c in zip(LEVELS, self.codes)}
+        d["probs"] = self.probs
+        d["stability"] = self.stability
+        return d
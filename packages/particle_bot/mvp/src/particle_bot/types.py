@@ -1,7 +1,8 @@
 from __future__ import annotations
+from dataclasses import dataclass, field
 from pydantic import BaseModel, Field
 from enum import Enum
-from typing import Optional, Literal, Dict, Any
+from typing import Optional, Literal, Dict, Any, Tuple
 from datetime import datetime
 
 
@@ -66,6 +67,50 @@ class BookDelta(BaseEvent):
     depth_n: int = 20
 
 
+# In-process mirrors of the high-rate event types. The synthetic feed and the event bus
+# pass these around unvalidated; the pydantic models stay the external/serialization
+# boundary (to_model()).
+
+@dataclass(slots=True, frozen=True)
+class TradePrintFast:
+    ts: datetime
+    recv_ts: datetime
+    symbol: Symbol
+    venue: Venue
+    price: float
+    size: float
+    side: TradeSide = TradeSide.UNKNOWN
+    meta: Dict[str, Any] = field(default_factory=dict)
+    etype: EventType = EventType.TRADE_PRINT
+
+    def to_model(self) -> TradePrint:
+        return TradePrint(
+            ts=self.ts, recv_ts=self.recv_ts, symbol=self.symbol, venue=self.venue,
+            price=self.price, size=self.size, side=self.side, meta=self.meta,
+        )
+
+
+@dataclass(slots=True, frozen=True)
+class BookDeltaFast:
+    ts: datetime
+    recv_ts: datetime
+    symbol: Symbol
+    venue: Venue
+    bids: list[Tuple[float, float]]   # (price, size), descending
+    asks: list[Tuple[float, float]]   # (price, size), ascending
+    depth_n: int = 20
+    meta: Dict[str, Any] = field(default_factory=dict)
+    etype: EventType = EventType.BOOK_DELTA
+
+    def to_model(self) -> BookDelta:
+        return BookDelta(
+            ts=self.ts, recv_ts=self.recv_ts, symbol=self.symbol, venue=self.venue,
+            bids=[BookLevel(price=p, size=s) for p, s in self.bids],
+            asks=[BookLevel(price=p, size=s) for p, s in self.asks],
+            depth_n=self.depth_n, meta=self.meta,
+        )
+
+
 class FundingTick(BaseEvent):
     etype: Literal[EventType.FUNDING_TICK] = EventType.FUNDING_TICK
     funding_rate: float
@@ -1,7 +1,17 @@
 from __future__ import annotations
+from typing import Optional
 import pandas as pd
 
 
-def apply_costs(returns: pd.Series, fee_bps: float = 5.0, slippage_bps: float = 5.0) -> pd.Series:
-    cost = (fee_bps + slippage_bps) / 10000.0
-    return returns - cost.abs()
+def per_bar_cost(fee_bps: float = 5.0, slippage_bps: float = 5.0) -> float:
+    """Fee + slippage as a non-negative return fraction."""
+    return abs((fee_bps + slippage_bps) / 10000.0)
+
+
+def apply_costs(returns: pd.Series, fee_bps: float = 5.0, slippage_bps: float = 5.0,
+                signal_change: Optional[pd.Series] = None) -> pd.Series:
+    # flat per-bar cost by default; with signal_change, charge only on position changes
+    cost = per_bar_cost(fee_bps, slippage_bps)
+    if signal_change is None:
+        return returns - cost
+    return returns - cost * signal_change.abs()
@@ -1,14 +1,86 @@
 from __future__ import annotations
+import numpy as np
 import pandas as pd
-from ..features.build_features import make_basic_features
-from .cost_model import apply_costs
+from ..features.build_features import ema, rsi
+from .cost_model import per_bar_cost
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional
+    njit = None
 
-def ema_crossover_backtest(df: pd.DataFrame, fee_bps: float = 5.0, slippage_bps: float = 5.0) -> pd.DataFrame:
-    data = make_basic_features(df)
-    data['signal'] = (data['ema_fast'] > data['ema_slow']).astype(int)
-    data['ret'] = data['close'].pct_change().fillna(0)
-    data['strat_ret_raw'] = data['signal'].shift(1).fillna(0) * data['ret']
-    data['strat_ret'] = apply_costs(data['strat_ret_raw'], fee_bps=fee_bps, slippage_bps=slippage_bps)
-    data['equity'] = (1 + data['strat_ret']).cumprod()
+FAST_SPAN = 20
+SLOW_SPAN = 100
+
+
+def _backtest_kernel(close: np.ndarray, span_fast: int, span_slow: int, cost: float):
+    """EMA fast/slow, long-flat signal, returns and equity for one close series.
+
+    Returns (ema_fast, ema_slow, signal, ret, strat_ret_raw, strat_ret, equity).
+    """
+    s = pd.Series(close)
+    ema_fast = ema(s, span_fast).to_numpy()
+    ema_slow = ema(s, span_slow).to_numpy()
+    signal = (ema_fast > ema_slow).astype(np.int64)
+    ret = s.pct_change().fillna(0).to_numpy()
+    strat_ret_raw = np.concatenate(([0.0], signal[:-1])) * ret if len(close) else ret
+    strat_ret = strat_ret_raw - cost
+    return ema_fast, ema_slow, signal, ret, strat_ret_raw, strat_ret, np.cumprod(1.0 + strat_ret)
+
+
+if njit is not None:
+    from ..features.build_features import _ema_nb
+
+    # no fastmath: closes can be nan, and nan has to fall through the comparisons like pandas
+    @njit(cache=True)
+    def _backtest_kernel(close, span_fast, span_slow, cost):  # noqa: F811
+        # EMAs via the shared ewm(adjust=False) kernel, then one pass with scalar state for
+        # the previous-bar signal, returns and equity
+        n = close.shape[0]
+        ema_fast = _ema_nb(close, span_fast)
+        ema_slow = _ema_nb(close, span_slow)
+        signal = np.zeros(n, dtype=np.int64)
+        ret = np.zeros(n)
+        strat_ret_raw = np.zeros(n)
+        strat_ret = np.empty(n)
+        equity = np.empty(n)
+        sig_prev = 0
+        eq = 1.0
+        for i in range(n):
+            if i > 0:
+                r = close[i] / close[i - 1] - 1.0
+                # pct_change().fillna(0): a nan on either side is a flat bar
+                if r == r:
+                    ret[i] = r
+                strat_ret_raw[i] = sig_prev * ret[i]
+            sig = 1 if ema_fast[i] > ema_slow[i] else 0
+            signal[i] = sig
+            strat_ret[i] = strat_ret_raw[i] - cost
+            eq *= 1.0 + strat_ret[i]
+            equity[i] = eq
+            sig_prev = sig
+        return ema_fast, ema_slow, signal, ret, strat_ret_raw, strat_ret, equity
+
+
+def compute_strategy_columns(df: pd.DataFrame, fee_bps: float = 5.0, slippage_bps: float = 5.0) -> pd.DataFrame:
+    # same columns as make_basic_features + the strategy columns; EMA/signal/returns/equity
+    # come out of one kernel call over the close array
+    data = df.copy()
+    close = np.ascontiguousarray(data['close'].to_numpy(dtype=np.float64))
+    cost = per_bar_cost(fee_bps, slippage_bps)
+    ema_fast, ema_slow, signal, ret, strat_ret_raw, strat_ret, equity = _backtest_kernel(
+        close, FAST_SPAN, SLOW_SPAN, cost
+    )
+    data['ema_fast'] = ema_fast
+    data['ema_slow'] = ema_slow
+    data['rsi_14'] = rsi(data['close'], 14)
+    data['signal'] = signal
+    data['ret'] = ret
+    data['strat_ret_raw'] = strat_ret_raw
+    data['strat_ret'] = strat_ret
+    data['equity'] = equity
     return data
+
+
+def ema_crossover_backtest(df: pd.DataFrame, fee_bps: float = 5.0, slippage_bps: float = 5.0) -> pd.DataFrame:
+    return compute_strategy_columns(df, fee_bps=fee_bps, slippage_bps=slippage_bps)
@@ -3,6 +3,8 @@ from dataclasses import dataclass, field
 from typing import List, Optional, Dict, Any
 import math
 
+import numpy as np
+
 @dataclass
 class SimOrder:
     client_id: str
@@ -34,6 +36,7 @@ class SimConfig:
     post_only: bool = False
     latency_ms: int = 0
     partial_fill_prob: float = 0.3
+    seed: Optional[int] = None    # partial-fill draws; None = fresh entropy
 
 @dataclass
 class Account:
@@ -42,6 +45,11 @@ class Account:
     equity: float = 0.0
 
 
+# order status codes for the vectorized book; mapped back to OrderState strings on return
+_OPEN, _PARTIAL, _FILLED, _REJECTED = 0, 1, 2, 3
+_STATUS = ('open', 'partially_filled', 'filled', 'rejected')
+
+
 def simulate_paper(ohlc: List[Dict[str, Any]], orders: List[SimOrder], cfg: SimConfig) -> Dict[str, Any]:
     """
     Very simple per-tick simulator using close prices as mid, applying:
@@ -49,83 +57,109 @@ def simulate_paper(ohlc: List[Dict[str, Any]], orders: List[SimOrder], cfg: SimC
     - partial fills with probability
     - fees & slippage
     - reduceOnly enforcement
+
+    Orders are held as NumPy arrays (one entry per order) and each tick fills every
+    crossing order at once; OrderState objects are only built on return.
     """
     ts_list = [int(x.get('ts', i)) for i, x in enumerate(ohlc)]
     px_list = [float(x['close']) for x in ohlc]
 
-    # index orders by client_id, enforce idempotency
-    book: Dict[str, OrderState] = {}
-    acct = Account(base_pos=0.0, quote=0.0, equity=0.0)
+    # index orders by client_id, enforce idempotency; all orders are accepted on the first tick
+    accepted: Dict[str, SimOrder] = {}
+    if ts_list:
+        for o in orders:
+            accepted.setdefault(o.client_id, o)
+    book = list(accepted.values())
+    n = len(book)
+
+    sides = np.array([1.0 if o.side == 'buy' else -1.0 for o in book])
+    sizes = np.array([o.size for o in book], dtype=float)
+    limits = np.array([np.nan if o.price is None else o.price for o in book], dtype=float)
+    is_limit = np.array([o.type == 'limit' for o in book], dtype=bool)
+    reduce_only = np.array([o.reduce_only for o in book], dtype=bool)
+    # execution price multiplier: slippage against the order side
+    slip = 1.0 + (cfg.slippage_bps / 10000.0) * sides
+
+    filled = np.zeros(n)
+    notional = np.zeros(n)          # running sum(px * size), avg_fill_price = notional / filled
+    status = np.full(n, _OPEN, dtype=np.int8)
+    reasons: List[Optional[str]] = [None] * n
+    fill_log: List[tuple] = []      # (order idx array, ts, px array, size array) per tick
 
+    rng = np.random.default_rng(cfg.seed)
+    fee_rate = cfg.fee_bps / 10000.0
+    acct = Account(base_pos=0.0, quote=0.0, equity=0.0)
     fees = 0.0
 
-    for idx, (ts, mid) in enumerate(zip(ts_list, px_list)):
-        # process any new orders that arrive at this ts (no latency queue for brevity)
-        for o in list(orders):
-            if o.client_id in book:
-                continue  # idempotent
-            # simulate immediate acceptance
-            st = OrderState(order=o, status='open')
-            book[o.client_id] = st
-
-        # walk open orders
-        for st in book.values():
-            if st.status not in ('open', 'partially_filled'):
-                continue
-            o = st.order
-            # limit crossing check
-            px_exec = mid
-            if o.type == 'limit':
-                if o.side == 'buy' and (o.price is None or o.price < mid):
-                    continue
-                if o.side == 'sell' and (o.price is None or o.price > mid):
-                    continue
+    with np.errstate(invalid='ignore'):  # nan limits (no price) never cross
+        for ts, mid in zip(ts_list, px_list):
+            # limit crossing check: buys fill at/above mid, sells at/below; market orders always
+            active = status <= _PARTIAL
+            cross = active & (~is_limit | np.where(sides > 0, limits >= mid, limits <= mid))
             # post-only reject if crossing
-            if cfg.post_only and o.type == 'limit':
-                st.status = 'rejected'
-                st.reason = 'post_only_cross'
-                continue
-            # compute slippage
-            px = px_exec * (1 + (cfg.slippage_bps/10000.0) * (1 if o.side == 'buy' else -1))
-            # partial fill amount
-            remaining = o.size - st.filled
-            fill_size = remaining
-            # probabilistic partials
-            if remaining > 0 and cfg.partial_fill_prob > 0.0:
-                import random
-                if random.random() < cfg.partial_fill_prob:
-                    fill_size = remaining * 0.25
-            if fill_size <= 0:
-                continue
-            # apply fill
-            st.fills.append(Fill(ts=ts, price=px, size=fill_size))
-            st.filled += fill_size
-            st.avg_fill_price = ((st.avg_fill_price * (st.filled - fill_size)) + px * fill_size) / max(st.filled, 1e-12)
-            if abs(st.filled - o.size) < 1e-12:
-                st.status = 'filled'
-            else:
-                st.status = 'partially_filled'
-            # reduceOnly enforcement: only decrease position
-            delta = fill_size if o.side == 'buy' else -fill_size
-            if o.reduce_only and ((acct.base_pos > 0 and delta > 0) or (acct.base_pos < 0 and delta < 0)):
-                st.status = 'rejected'
-                st.reason = 'reduce_only_violation'
-                continue
-            # update positions and cash
-            if o.side == 'buy':
-                acct.base_pos += fill_size
-                acct.quote -= px * fill_size
-            else:
-                acct.base_pos -= fill_size
-                acct.quote += px * fill_size
-            # fees
-            fees += abs(px * fill_size) * (cfg.fee_bps/10000.0)
-
-        # recompute equity as mark-to-market
-        acct.equity = acct.quote + acct.base_pos * mid
+            if cfg.post_only:
+                rejected = cross & is_limit
+                for i in np.flatnonzero(rejected):
+                    status[i] = _REJECTED
+                    reasons[i] = 'post_only_cross'
+                cross &= ~is_limit
+            idx = np.flatnonzero(cross)
+            if len(idx):
+                # partial fill amount; probabilistic partials fill a quarter of what remains
+                fill = sizes[idx] - filled[idx]
+                if cfg.partial_fill_prob > 0.0:
+                    partial = (fill > 0) & (rng.random(len(idx)) < cfg.partial_fill_prob)
+                    fill[partial] *= 0.25
+                keep = fill > 0
+                idx, fill = idx[keep], fill[keep]
+                px = mid * slip[idx]
+
+                # apply fills
+                fill_log.append((idx, ts, px, fill))
+                filled[idx] += fill
+                notional[idx] += px * fill
+                status[idx] = np.where(np.abs(filled[idx] - sizes[idx]) < 1e-12, _FILLED, _PARTIAL)
+
+                # reduceOnly enforcement: only decrease position. Depends on the position left by
+                # the orders before it in this tick, so only then is the tick walked in order.
+                delta = sides[idx] * fill
+                ro = reduce_only[idx]
+                if ro.any():
+                    ok = np.ones(len(idx), dtype=bool)
+                    pos = acct.base_pos
+                    for j in range(len(idx)):
+                        if ro[j] and ((pos > 0 and delta[j] > 0) or (pos < 0 and delta[j] < 0)):
+                            ok[j] = False
+                            status[idx[j]] = _REJECTED
+                            reasons[idx[j]] = 'reduce_only_violation'
+                        else:
+                            pos += delta[j]
+                    px, fill, delta = px[ok], fill[ok], delta[ok]
+
+                # update positions and cash, fees
+                acct.base_pos += float(delta.sum())
+                acct.quote -= float((delta * px).sum())
+                fees += float(np.abs(px * fill).sum()) * fee_rate
+
+            # recompute equity as mark-to-market
+            acct.equity = acct.quote + acct.base_pos * mid
+
+    states = [
+        OrderState(
+            order=o,
+            status=_STATUS[status[i]],
+            filled=float(filled[i]),
+            avg_fill_price=float(notional[i] / max(filled[i], 1e-12)) if filled[i] else 0.0,
+            reason=reasons[i],
+        )
+        for i, o in enumerate(book)
+    ]
+    for idx, ts, px, fill in fill_log:
+        for i, p, q in zip(idx.tolist(), px.tolist(), fill.tolist()):
+            states[i].fills.append(Fill(ts=ts, price=p, size=q))
 
     return {
-        'orders': [st.__dict__ | {'fills': [f.__dict__ for f in st.fills]} for st in book.values()],
+        'orders': [st.__dict__ | {'fills': [f.__dict__ for f in st.fills]} for st in states],
         'account': acct.__dict__,
         'fees': fees
     }
@@ -1,21 +1,32 @@
 from __future__ import annotations
 import pandas as pd
-from .engine import ema_crossover_backtest
+from .engine import compute_strategy_columns
 
 
 def walkforward(df: pd.DataFrame, n_splits: int = 3):
-    n = len(df)
+    # EMAs are recursive filters: run the strategy once over the whole series and
+    # slice the folds out of it instead of re-warming the indicators per split
+    data = compute_strategy_columns(df)
+    equity = data['equity'].to_numpy()
+    strat_ret = data['strat_ret'].to_numpy()
+    n = len(data)
     split = n // (n_splits + 1)
     results = []
     for i in range(n_splits):
-        train = df.iloc[: (i+1)*split]
-        test = df.iloc[(i+1)*split : (i+2)*split]
-        res = ema_crossover_backtest(test)
+        start, end = (i+1)*split, min((i+2)*split, n)
+        test = data.iloc[start:end]
+        if end > start:
+            # compounded return over the fold, relative to equity at the bar before it
+            base = equity[start-1] if start > 0 else 1.0
+            final_equity = float(equity[end-1] / base)
+            avg_ret = float(strat_ret[start:end].mean())
+        else:
+            final_equity, avg_ret = 1.0, 0.0
         results.append({
             'split': i,
             'test_start': test.index.min(),
             'test_end': test.index.max(),
-            'final_equity': float(res['equity'].iloc[-1]) if len(res) else 1.0,
-            'avg_ret': float(res['strat_ret'].mean()) if len(res) else 0.0,
+            'final_equity': final_equity,
+            'avg_ret': avg_ret,
         })
     return results
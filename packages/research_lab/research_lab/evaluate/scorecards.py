@@ -2,27 +2,74 @@ from __future__ import annotations
 import pandas as pd
 import numpy as np
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional
+    njit = None
 
-def sharpe(returns: pd.Series, ann_factor: int = 365) -> float:
-    mu = returns.mean()
-    sd = returns.std()
-    if sd == 0 or np.isnan(sd):
+
+def _scorecard_kernel(r: np.ndarray):
+    """(mean, sample var, n_pos, n) over the non-NaN returns, like the pandas reductions."""
+    r = r[~np.isnan(r)]
+    n = r.shape[0]
+    if n == 0:
+        return np.nan, np.nan, 0, 0
+    var = float(r.var(ddof=1)) if n > 1 else np.nan
+    return float(r.mean()), var, int((r > 0).sum()), n
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _scorecard_kernel(r):  # noqa: F811
+        # single pass, Welford for the variance; NaNs are skipped
+        n = 0
+        n_pos = 0
+        mu = 0.0
+        m2 = 0.0
+        for i in range(r.shape[0]):
+            x = r[i]
+            if x != x:
+                continue
+            n += 1
+            if x > 0.0:
+                n_pos += 1
+            d = x - mu
+            mu += d / n
+            m2 += d * (x - mu)
+        if n == 0:
+            return np.nan, np.nan, 0, 0
+        var = m2 / (n - 1) if n > 1 else np.nan
+        return mu, var, n_pos, n
+
+
+def _stats(returns) -> tuple:
+    return _scorecard_kernel(np.ascontiguousarray(np.asarray(returns, dtype=np.float64)))
+
+
+def _sharpe(mu: float, var: float, ann_factor: int) -> float:
+    if np.isnan(var) or var <= 0:
         return 0.0
-    return float((mu / sd) * (ann_factor**0.5))
+    return float((mu / np.sqrt(var)) * (ann_factor**0.5))
+
+
+def sharpe(returns: pd.Series, ann_factor: int = 365) -> float:
+    mu, var, _, _ = _stats(returns)
+    return _sharpe(mu, var, ann_factor)
 
 
 def win_rate(returns: pd.Series) -> float:
-    pos = (returns > 0).sum()
-    neg = (returns <= 0).sum()
-    tot = pos + neg
-    return float(pos / tot) if tot else 0.0
+    _, _, n_pos, n = _stats(returns)
+    return float(n_pos / n) if n else 0.0
 
 
 def pass_fail(df: pd.DataFrame, min_sharpe: float = 1.0, min_equity: float = 1.05) -> dict:
-    s = sharpe(df['strat_ret'])
+    # one scan of strat_ret feeds both sharpe and win_rate
+    mu, var, n_pos, n = _stats(df['strat_ret'])
+    s = _sharpe(mu, var, 365)
     eq = float(df['equity'].iloc[-1]) if len(df) else 1.0
     return {
         'sharpe': s,
+        'win_rate': float(n_pos / n) if n else 0.0,
         'final_equity': eq,
         'pass': bool(s >= min_sharpe and eq >= min_equity)
     }
@@ -2,17 +2,80 @@ from __future__ import annotations
 import pandas as pd
 import numpy as np
 
+try:
+    from numba import njit
+except ImportError:  # numba is optional; pandas ewm/rolling are used instead
+    njit = None
+
 
 def ema(series: pd.Series, span: int) -> pd.Series:
-    return series.ewm(span=span, adjust=False).mean()
+    if njit is None:
+        return series.ewm(span=span, adjust=False).mean()
+    return pd.Series(_ema_nb(series.to_numpy(dtype=np.float64), span), index=series.index, name=series.name)
 
 
 def rsi(series: pd.Series, period: int = 14) -> pd.Series:
-    delta = series.diff()
-    gain = (delta.where(delta > 0, 0)).rolling(period).mean()
-    loss = (-delta.where(delta < 0, 0)).rolling(period).mean()
-    rs = gain / (loss + 1e-12)
-    return 100 - (100 / (1 + rs))
+    if njit is None:
+        delta = series.diff()
+        gain = (delta.where(delta > 0, 0)).rolling(period).mean()
+        loss = (-delta.where(delta < 0, 0)).rolling(period).mean()
+        rs = gain / (loss + 1e-12)
+        return 100 - (100 / (1 + rs))
+    return pd.Series(_rsi_nb(series.to_numpy(dtype=np.float64), period), index=series.index, name=series.name)
+
+
+if njit is not None:
+    # no fastmath: closes can be nan and the kernels have to compare them like pandas does
+    @njit(cache=True)
+    def _ema_nb(x, span):
+        # ewm(span, adjust=False) including its nan handling: leading nans stay nan, a nan
+        # carries the last value forward and still decays the old weight by (1 - a)
+        n = x.shape[0]
+        out = np.empty(n)
+        a = 2.0 / (span + 1.0)
+        e = np.nan
+        old_wt = 1.0
+        for i in range(n):
+            v = x[i]
+            if e != e:
+                if v == v:
+                    e = v
+            else:
+                old_wt *= 1.0 - a
+                if v == v:
+                    if e != v:
+                        e = (old_wt * e + a * v) / (old_wt + a)
+                    old_wt = 1.0
+            out[i] = e
+        return out
+
+    @njit(cache=True)
+    def _rsi_nb(x, period):
+        # simple-mean RSI (same as the rolling(period).mean() version): running sums of
+        # gains/losses over a sliding window, nan until the first full window; a nan
+        # delta counts as neither gain nor loss, like delta.where(...) filling 0
+        n = x.shape[0]
+        out = np.full(n, np.nan)
+        gains = np.zeros(n)
+        losses = np.zeros(n)
+        g_sum = 0.0
+        l_sum = 0.0
+        for i in range(n):
+            if i > 0:
+                d = x[i] - x[i - 1]
+                if d > 0:
+                    gains[i] = d
+                elif d < 0:
+                    losses[i] = -d
+            g_sum += gains[i]
+            l_sum += losses[i]
+            if i >= period:
+                g_sum -= gains[i - period]
+                l_sum -= losses[i - period]
+            if i >= period - 1:
+                rs = (g_sum / period) / (l_sum / period + 1e-12)
+                out[i] = 100.0 - 100.0 / (1.0 + rs)
+        return out
 
 
 def make_basic_features(df: pd.DataFrame, price_col: str = "close") -> pd.DataFrame:
@@ -1,26 +1,38 @@
 from __future__ import annotations
 from typing import List, Dict, Any, Tuple
 import numpy as np
+import pandas as pd
 
 
-def volume_profile_from_trades(ohlcv_or_ticks: List[Dict[str, Any]], price_key: str = 'close', size_key: str | None = None, bins: int = 100) -> Dict[str, Any]:
-    prices = []
-    sizes = []
-    for x in ohlcv_or_ticks:
-        p = x.get(price_key)
-        if p is None:
-            continue
-        prices.append(float(p))
-        if size_key and x.get(size_key) is not None:
-            sizes.append(float(x.get(size_key)))
+def _price_size_arrays(rows: List[Dict[str, Any]], price_key: str, size_key: str | None) -> Tuple[np.ndarray, np.ndarray]:
+    # one pass over the dicts straight into a flat (n, 2) float64 buffer
+    def pairs():
+        for x in rows:
+            p = x.get(price_key)
+            if p is None:
+                continue
+            s = x.get(size_key) if size_key else None
+            yield (p, 1.0 if s is None else s)  # count proxy if no size
+    arr = np.fromiter(pairs(), dtype=np.dtype((np.float64, 2)))
+    return arr[:, 0], arr[:, 1]
+
+
+def volume_profile_from_trades(ohlcv_or_ticks: List[Dict[str, Any]] | pd.DataFrame, price_key: str = 'close', size_key: str | None = None, bins: int = 100) -> Dict[str, Any]:
+    if isinstance(ohlcv_or_ticks, pd.DataFrame):
+        df = ohlcv_or_ticks[ohlcv_or_ticks[price_key].notna()]
+        prices = df[price_key].to_numpy(dtype=np.float64)
+        if size_key and size_key in df:
+            sizes = df[size_key].fillna(1.0).to_numpy(dtype=np.float64)
         else:
-            sizes.append(1.0)  # count proxy if no size
-    if not prices:
+            sizes = np.ones(len(prices))
+    else:
+        prices, sizes = _price_size_arrays(ohlcv_or_ticks, price_key, size_key)
+    if not len(prices):
         return {"bins": [], "hist": []}
-    pmin, pmax = min(prices), max(prices)
+    pmin, pmax = float(prices.min()), float(prices.max())
     if pmin == pmax:
         pmax = pmin + 1e-6
-    hist, edges = np.histogram(prices, bins=bins, range=(pmin, pmax), weights=np.array(sizes))
+    hist, edges = np.histogram(prices, bins=bins, range=(pmin, pmax), weights=sizes)
     centers = ((edges[:-1] + edges[1:]) / 2.0).tolist()
     return {"bins": centers, "hist": hist.tolist()}
 
@@ -6,6 +6,14 @@ from typing import Optional, Tuple, Dict, Any
 
 import pandas as pd
 
+from .gnosis_runner import write_trials
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to the stdlib decoder
+    _loads = json.loads
+
 # Wire Yoshi-Bot (Gnosis) source path so we can import its modules
 import sys
 _GNOSIS_SRC = Path(__file__).resolve().parents[3] / 'bots' / 'Yoshi-Bot' / 'src'
@@ -21,13 +29,14 @@ except Exception as e:  # pragma: no cover - handled at runtime
 
 
 def _iter_jsonl(path: Path):
-    with path.open('r', encoding='utf-8') as f:
+    with path.open('rb') as f:
+        # bytes straight to the decoder (it skips surrounding whitespace); blank and
+        # whitespace-only lines fail to decode and are dropped below
         for line in f:
-            line = line.strip()
-            if not line:
+            if line == b'\n':
                 continue
             try:
-                yield json.loads(line)
+                yield _loads(line)
             except Exception:
                 continue
 
@@ -132,17 +141,14 @@ def run_gnosis(path: str,
     out_dir = Path('data/artifacts/gnosis') / run_id
     out_dir.mkdir(parents=True, exist_ok=True)
     # Save trials and selection
-    try:
-        trials_df.to_parquet(out_dir / 'trials.parquet', index=False)
-    except Exception:
-        trials_df.to_csv(out_dir / 'trials.csv', index=False)
+    trials_path = write_trials(trials_df, out_dir)
     (out_dir / 'selection.json').write_text(json.dumps(selection, indent=2))
 
     summary = {
         'run_id': run_id,
         'n_prints': int(len(prints_df)),
         'artifacts': {
-            'trials': str(out_dir / ('trials.parquet' if (out_dir / 'trials.parquet').exists() else 'trials.csv')),
+            'trials': str(trials_path),
             'selection': str(out_dir / 'selection.json'),
         },
         'selection': selection,
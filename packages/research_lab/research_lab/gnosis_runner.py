@@ -6,8 +6,15 @@ from pathlib import Path
 from typing import Dict, Any, Tuple
 from datetime import datetime, timezone
 
+import numpy as np
 import pandas as pd
 
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # pyarrow is optional; pandas picks whatever parquet engine exists
+    pa = pq = None
+
 # Make the Yoshi-Bot (gnosis) src importable
 _YOSHI_SRC = Path(__file__).resolve().parents[3] / "bots" / "Yoshi-Bot" / "src"
 if _YOSHI_SRC.exists():
@@ -22,32 +29,51 @@ except Exception as e:  # pragma: no cover
     RalphLoop = None  # type: ignore
 
 # Reuse our particle adapter to turn JSONL events into a price series
-from .ingest.particle_adapter import extract_trades
+from .ingest.particle_adapter import extract_trades_arrays
 
 
 def _particle_jsonl_to_prints_df(path: str, symbol: str = "BTCUSDT") -> pd.DataFrame:
-    ts, px = extract_trades(path)
-    if not ts:
+    ts, px = extract_trades_arrays(path)
+    if not len(ts):
         raise ValueError("No trades found in particle JSONL")
     # Build a minimal prints DataFrame expected by gnosis.ingest.loader
     # Columns: timestamp (datetime), symbol, price, quantity, side, trade_id
     df = pd.DataFrame({
-        "timestamp": pd.to_datetime(pd.Series(ts), unit="ms", utc=True),
+        "timestamp": pd.to_datetime(ts, unit="ms", utc=True),
         "symbol": symbol,
-        "price": pd.Series(px, dtype=float),
+        "price": px,
     })
     # Fill quantity/side/trade_id with dummies (acceptable for feature building)
     df["quantity"] = 0.001
-    # crude side: price change sign
-    side = ["BUY"]
-    for i in range(1, len(px)):
-        side.append("BUY" if px[i] >= px[i-1] else "SELL")
-    df["side"] = side
+    # crude side: price change sign (first print counts as an uptick)
+    up = np.empty(len(px), dtype=bool)
+    up[0] = True
+    np.greater_equal(px[1:], px[:-1], out=up[1:])
+    df["side"] = np.where(up, "BUY", "SELL")
     df["trade_id"] = [f"{symbol}_{i}" for i in range(len(df))]
     df = df.sort_values("timestamp").reset_index(drop=True)
     return df
 
 
+def write_trials(trials_df: pd.DataFrame, out_dir: Path) -> Path:
+    """Write trials to out_dir/trials.parquet (zstd, 64k-row groups), or trials.csv if that fails."""
+    trials_path = out_dir / "trials.parquet"
+    try:
+        if pq is None:
+            trials_df.to_parquet(trials_path, index=False)
+        else:
+            table = pa.Table.from_pandas(trials_df, preserve_index=False)
+            with pq.ParquetWriter(trials_path, table.schema, compression="zstd",
+                                  compression_level=3, use_dictionary=True) as writer:
+                writer.write_table(table, row_group_size=65536)
+        return trials_path
+    except Exception:
+        trials_path.unlink(missing_ok=True)
+        csv_path = out_dir / "trials.csv"
+        trials_df.to_csv(csv_path, index=False)
+        return csv_path
+
+
 def _default_base_config() -> Dict[str, Any]:
     return {
         "domains": {"D0": {"n_trades": 200}},
@@ -119,11 +145,7 @@ def run_gnosis(source: Dict[str, Any], base_config: Dict[str, Any] | None = None
     out_dir = Path("data/artifacts/gnosis") / run_id
     out_dir.mkdir(parents=True, exist_ok=True)
 
-    trials_path = out_dir / "trials.parquet"
-    try:
-        trials_df.to_parquet(trials_path, index=False)
-    except Exception:
-        trials_df.to_csv(out_dir / "trials.csv", index=False)
+    trials_path = write_trials(trials_df, out_dir)
 
     report = {
         "run_id": run_id,
@@ -134,7 +156,7 @@ def run_gnosis(source: Dict[str, Any], base_config: Dict[str, Any] | None = None
         "horizon_trades": horizon,
         "selected": selected_json,
         "artifacts": {
-            "trials": str(trials_path if trials_path.exists() else (out_dir / "trials.csv")),
+            "trials": str(trials_path),
         },
     }
 
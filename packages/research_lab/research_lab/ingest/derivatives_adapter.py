@@ -2,6 +2,12 @@ from __future__ import annotations
 import json
 from typing import Iterable, Dict, Any, Tuple, List
 
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to the stdlib decoder
+    _loads = json.loads
+
 # Event types expected from particle/derivs JSONL: funding_tick, oi_tick, basis_tick
 
 DERIV_TYPES = {
@@ -12,13 +18,14 @@ DERIV_TYPES = {
 
 
 def iter_events_jsonl(path: str) -> Iterable[Dict[str, Any]]:
-    with open(path, 'r', encoding='utf-8') as f:
+    with open(path, 'rb') as f:
+        # bytes straight to the decoder (it skips surrounding whitespace); blank and
+        # whitespace-only lines fail to decode and are dropped below
         for line in f:
-            line = line.strip()
-            if not line:
+            if line == b'\n':
                 continue
             try:
-                yield json.loads(line)
+                yield _loads(line)
             except Exception:
                 continue
 
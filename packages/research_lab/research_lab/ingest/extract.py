@@ -8,17 +8,21 @@ PATTERNS = [
     re.compile(r"EMA\s*(\d+).+EMA\s*(\d+).+(crossover|cross over)", re.I),
     re.compile(r"RSI\s*(\d+).+(overbought|oversold)", re.I),
 ]
+# every PATTERNS entry as one alternation, so the text is scanned once
+_ANY_PATTERN = re.compile("|".join(f"(?:{p.pattern})" for p in PATTERNS), re.I)
+# each pattern needs one of these literals; casefold() matches re.I's case folding
+_KEYWORDS = ("ema", "rsi")
 
 def extract_candidate(url: str, text: str) -> CandidateStrategy | None:
-    for pat in PATTERNS:
-        if pat.search(text):
-            name = "ema_crossover"
-            ts = int(time.time())
-            params: Dict[str, Any] = {"fast": 20, "slow": 100, "timeframe": "1m"}
-            return CandidateStrategy(
-                name=name,
-                version=f"{ts}",
-                params=params,
-                source_ref=url,
-            )
+    folded = text.casefold()
+    if any(k in folded for k in _KEYWORDS) and _ANY_PATTERN.search(text):
+        name = "ema_crossover"
+        ts = int(time.time())
+        params: Dict[str, Any] = {"fast": 20, "slow": 100, "timeframe": "1m"}
+        return CandidateStrategy(
+            name=name,
+            version=f"{ts}",
+            params=params,
+            source_ref=url,
+        )
     return None
@@ -1,6 +1,14 @@
 from __future__ import annotations
 import json
-from typing import Iterable, Dict, Any, Tuple
+from typing import Iterable, Iterator, Dict, Any, Tuple
+
+import numpy as np
+
+try:
+    import orjson
+    _loads = orjson.loads
+except ImportError:  # orjson is optional; fall back to the stdlib decoder
+    _loads = json.loads
 
 # Reads particle bot JSONL events and extracts a simple OHLCV-like series
 # focusing on trade prints as the primary truth.
@@ -9,44 +17,58 @@ TRADE_KEYS = {"TRADE_PRINT", "trade_print"}
 
 
 def iter_events_jsonl(path: str) -> Iterable[Dict[str, Any]]:
-    with open(path, 'r', encoding='utf-8') as f:
+    with open(path, 'rb') as f:
+        # bytes straight to the decoder (it skips surrounding whitespace); blank and
+        # whitespace-only lines fail to decode and are dropped below
         for line in f:
-            line = line.strip()
-            if not line:
+            if line == b'\n':
                 continue
             try:
-                yield json.loads(line)
+                yield _loads(line)
             except Exception:
                 continue
 
 
+_TRADE_ETYPES = {e.lower() for e in TRADE_KEYS}
+_TRADE_ROW = np.dtype([("ts", np.int64), ("px", np.float64)])
+
+
+def _iter_trade_rows(path: str) -> Iterator[Tuple[int, float]]:
+    for ev in iter_events_jsonl(path):
+        etype = (ev.get('etype') or ev.get('event_type') or '').lower()
+        if etype not in _TRADE_ETYPES:
+            continue
+        # timestamp field tolerance
+        ts = ev.get('ts') or ev.get('timestamp') or ev.get('t')
+        if not isinstance(ts, (int, float)):
+            # if ISO string or absent, skip
+            continue
+        price = ev.get('price')
+        if price is None:
+            continue
+        try:
+            px = float(price)
+        except Exception:
+            continue
+        yield int(ts), px
+
+
+def extract_trades_arrays(path: str) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Return (timestamps_ms int64[:], prices float64[:]) using trade events only.
+    Rows are written straight into one structured array instead of two Python lists.
+    """
+    rows = np.fromiter(_iter_trade_rows(path), dtype=_TRADE_ROW)
+    return rows["ts"], rows["px"]
+
+
 def extract_trades(path: str) -> Tuple[list[int], list[float]]:
     """
     Return (timestamps_ms, prices) lists using trade events only.
     Attempts to accommodate both MVP and derivs formats.
     """
-    ts_list: list[int] = []
-    px_list: list[float] = []
-    for ev in iter_events_jsonl(path):
-        etype = (ev.get('etype') or ev.get('event_type') or '').lower()
-        if etype in {e.lower() for e in TRADE_KEYS}:
-            # timestamp field tolerance
-            ts = ev.get('ts') or ev.get('timestamp') or ev.get('t')
-            if isinstance(ts, (int, float)):
-                ts_ms = int(ts)
-            else:
-                # if ISO string or absent, skip
-                continue
-            price = ev.get('price')
-            if price is None:
-                continue
-            try:
-                px = float(price)
-            except Exception:
-                continue
-            ts_list.append(ts_ms)
-            px_list.append(px)
-    return ts_list, px_list
+    ts, px = extract_trades_arrays(path)
+    return ts.tolist(), px.tolist()
 
 
 def trades_to_close_series(timestamps_ms: list[int], prices: list[float]) -> list[dict]:
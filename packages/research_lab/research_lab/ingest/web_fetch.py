@@ -1,8 +1,15 @@
 from __future__ import annotations
 import requests
-from bs4 import BeautifulSoup
 from .allowlist import allowed
 
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:  # selectolax is optional; BeautifulSoup's html.parser is the fallback
+    HTMLParser = None
+    from bs4 import BeautifulSoup
+
+_DROP_TAGS = ["script", "style", "noscript"]
+
 class FetchError(Exception):
     pass
 
@@ -11,8 +18,14 @@ def fetch_text(url: str) -> str:
         raise FetchError("domain not allowlisted")
     r = requests.get(url, timeout=30)
     r.raise_for_status()
-    soup = BeautifulSoup(r.text, 'html.parser')
-    for tag in soup(["script", "style", "noscript"]):
-        tag.decompose()
-    text = soup.get_text(separator='\n')
+    if HTMLParser is not None:
+        # parse the raw bytes and let selectolax sniff the charset (no r.text decode)
+        tree = HTMLParser(r.content, detect_encoding=True)
+        tree.strip_tags(_DROP_TAGS)
+        text = tree.root.text(separator='\n') if tree.root is not None else ''
+    else:
+        soup = BeautifulSoup(r.text, 'html.parser')
+        for tag in soup(_DROP_TAGS):
+            tag.decompose()
+        text = soup.get_text(separator='\n')
     return '\n'.join(line.strip() for line in text.splitlines() if line.strip())
@@ -2,6 +2,148 @@ from __future__ import annotations
 from typing import Dict, Any, List, Tuple
 import pandas as pd
 import numpy as np
+from ..features.build_features import ema, rsi
+
+try:
+    from numba import njit, prange
+except ImportError:  # numba is optional; pandas rolling is used instead
+    njit = None
+
+
+# ----- Rolling-window primitives -----
+# Same semantics as pandas .rolling(window) with default min_periods (nan until the window
+# holds `window` non-nan values); var/std use ddof=1.
+
+def _rolling_sum_var(x: np.ndarray, window: int) -> Tuple[np.ndarray, np.ndarray]:
+    s = pd.Series(x).rolling(window)
+    return s.sum().to_numpy(), s.var().to_numpy()
+
+
+if njit is not None:
+    @njit(cache=True)
+    def _rolling_sum_var(x, window):  # noqa: F811
+        # one pass: running sum plus Welford add/remove for the variance (pandas' scheme);
+        # a window of identical values reports exactly 0 variance
+        n = x.shape[0]
+        out_sum = np.full(n, np.nan)
+        out_var = np.full(n, np.nan)
+        nobs = 0
+        total = 0.0
+        mean = 0.0
+        m2 = 0.0
+        prev = np.nan
+        same_run = 0
+        for i in range(n):
+            v = x[i]
+            if v == v:
+                nobs += 1
+                total += v
+                d = v - mean
+                mean += d / nobs
+                m2 += d * (v - mean)
+            if v == prev:
+                same_run += 1
+            else:
+                same_run = 1
+            prev = v
+            if i >= window:
+                u = x[i - window]
+                if u == u:
+                    nobs -= 1
+                    total -= u
+                    if nobs > 0:
+                        d = u - mean
+                        mean -= d / nobs
+                        m2 -= d * (u - mean)
+                    else:
+                        mean = 0.0
+                        m2 = 0.0
+            if i >= window - 1 and nobs >= window:
+                out_sum[i] = total
+                if same_run >= window:
+                    out_var[i] = 0.0
+                elif nobs > 1:
+                    out_var[i] = max(m2 / (nobs - 1), 0.0)
+        return out_sum, out_var
+
+
+def _zscore_roll_cols(X: np.ndarray, window: int) -> np.ndarray:
+    """Row-wise rolling z-score of a (k, n) array: (x - mean).fillna(0) / (std + 1e-9)."""
+    out = np.empty_like(X)
+    for r in range(X.shape[0]):
+        total, var = _rolling_sum_var(X[r], window)
+        num = X[r] - total / window
+        out[r] = np.where(np.isnan(num), 0.0, num) / (np.sqrt(var) + 1e-9)
+    return out
+
+
+def _pct_rank(x: np.ndarray) -> np.ndarray:
+    """Series.rank(pct=True): average rank of ties over the non-nan count, nan stays nan."""
+    return pd.Series(x).rank(pct=True).to_numpy()
+
+
+if njit is not None:
+    # no fastmath here: nan marks the warm-up rows and has to compare like plain IEEE
+    @njit(cache=True, parallel=True)
+    def _zscore_roll_cols(X, window):  # noqa: F811
+        # rows (e.g. funding, oi) are independent series
+        k, n = X.shape
+        out = np.empty((k, n))
+        for r in prange(k):
+            total, var = _rolling_sum_var(X[r], window)
+            for i in range(n):
+                num = X[r, i] - total[i] / window
+                if num != num:
+                    num = 0.0
+                out[r, i] = num / (np.sqrt(var[i]) + 1e-9)
+        return out
+
+    @njit(cache=True)
+    def _pct_rank(x):  # noqa: F811
+        n = x.shape[0]
+        out = np.full(n, np.nan)
+        order = np.argsort(x)  # nans sort last
+        m = 0
+        for i in range(n):
+            if x[i] == x[i]:
+                m += 1
+        i = 0
+        while i < m:
+            j = i
+            while j + 1 < m and x[order[j + 1]] == x[order[i]]:
+                j += 1
+            r = (i + j) / 2.0 + 1.0
+            for q in range(i, j + 1):
+                out[order[q]] = r / m
+            i = j + 1
+        return out
+
+
+def _rank_pct(s: pd.Series) -> pd.Series:
+    return pd.Series(_pct_rank(np.ascontiguousarray(s.to_numpy(dtype=np.float64))), index=s.index)
+
+
+def _rolling(s: pd.Series, window: int) -> Tuple[pd.Series, pd.Series]:
+    """(rolling sum, rolling var) of a Series, computed in one pass."""
+    total, var = _rolling_sum_var(np.ascontiguousarray(s.to_numpy(dtype=np.float64)), int(window))
+    return pd.Series(total, index=s.index), pd.Series(var, index=s.index)
+
+
+def _rolling_sum(s: pd.Series, window: int) -> pd.Series:
+    return _rolling(s, window)[0]
+
+
+def _rolling_mean(s: pd.Series, window: int) -> pd.Series:
+    return _rolling(s, window)[0] / window
+
+
+def _rolling_var(s: pd.Series, window: int) -> pd.Series:
+    return _rolling(s, window)[1]
+
+
+def _rolling_std(s: pd.Series, window: int) -> pd.Series:
+    return np.sqrt(_rolling(s, window)[1])
+
 
 # Basic feature set aligned with earlier build_features
 
@@ -9,17 +151,10 @@ def make_features(df: pd.DataFrame, price_col: str = 'close', windows: Dict[str,
     w = windows or {"ema_fast": 20, "ema_slow": 100, "rv": 50}
     out = df.copy()
     out['ret'] = out[price_col].pct_change().fillna(0)
-    out['ema_fast'] = out[price_col].ewm(span=w['ema_fast'], adjust=False).mean()
-    out['ema_slow'] = out[price_col].ewm(span=w['ema_slow'], adjust=False).mean()
-    out['rv'] = out['ret'].rolling(w['rv']).std().fillna(method='bfill').fillna(0)
-    # RSI(14)
-    delta = out[price_col].diff()
-    gain = np.where(delta > 0, delta, 0.0)
-    loss = np.where(delta < 0, -delta, 0.0)
-    roll_up = pd.Series(gain, index=out.index).rolling(14).mean()
-    roll_down = pd.Series(loss, index=out.index).rolling(14).mean()
-    rs = roll_up / (roll_down + 1e-12)
-    out['rsi_14'] = 100 - (100 / (1 + rs))
+    out['ema_fast'] = ema(out[price_col], w['ema_fast'])
+    out['ema_slow'] = ema(out[price_col], w['ema_slow'])
+    out['rv'] = _rolling_std(out['ret'], w['rv']).bfill().fillna(0)
+    out['rsi_14'] = rsi(out[price_col], 14)
     # Directional strength proxy
     out['dir_strength'] = (out['ema_fast'] - out['ema_slow']).abs() / (out['rv'] + 1e-9)
     out.replace([np.inf, -np.inf], 0.0, inplace=True)
@@ -40,7 +175,7 @@ def label_kingdom(feats: pd.DataFrame) -> pd.Series:
 def label_phylum(feats: pd.DataFrame) -> pd.Series:
     # vol regime by realized vol percentiles
     rv = feats['rv']
-    p = rv.rank(pct=True)
+    p = _rank_pct(rv)
     lab = pd.Series(index=feats.index, dtype=object)
     lab[p < 0.15] = 'compression'
     lab[p > 0.75] = 'expansion'
@@ -99,10 +234,10 @@ def add_class_features(feats: pd.DataFrame, aux: Dict[str, Any] | None = None) -
         # proxy: funding ~ normalized momentum sign
         out['funding'] = np.sign(out['ema_fast'] - out['ema_slow']).fillna(0)
     if aux and 'oi' in aux:
-        out['oi'] = pd.Series(aux['oi'], index=out.index).fillna(method='ffill').fillna(0)
+        out['oi'] = pd.Series(aux['oi'], index=out.index).ffill().fillna(0)
     else:
         # proxy: oi ~ cumulative abs returns
-        out['oi'] = out['ret'].abs().rolling(100).sum().fillna(0)
+        out['oi'] = _rolling_sum(out['ret'].abs(), 100).fillna(0)
     if aux and 'basis' in aux:
         out['basis'] = pd.Series(aux['basis'], index=out.index).fillna(0)
     else:
@@ -112,9 +247,11 @@ def add_class_features(feats: pd.DataFrame, aux: Dict[str, Any] | None = None) -
 
 
 def label_clazz(feats: pd.DataFrame) -> pd.Series:
-    fz = (feats['funding'] - feats['funding'].rolling(500).mean()).fillna(0) / (feats['funding'].rolling(500).std() + 1e-9)
-    oiz = (feats['oi'] - feats['oi'].rolling(500).mean()).fillna(0) / (feats['oi'].rolling(500).std() + 1e-9)
-    basis_pct = feats['basis'].rank(pct=True)
+    z = _zscore_roll_cols(np.vstack([feats['funding'].to_numpy(dtype=np.float64),
+                                     feats['oi'].to_numpy(dtype=np.float64)]), 500)
+    fz = pd.Series(z[0], index=feats.index)
+    oiz = pd.Series(z[1], index=feats.index)
+    basis_pct = _rank_pct(feats['basis'])
     squeeze = (oiz > 0.8).astype(int) * (basis_pct.between(0.4, 0.6)).astype(int)
     lab = pd.Series(index=feats.index, dtype=object)
     lab[squeeze == 1] = 'squeeze_setup'
@@ -127,7 +264,7 @@ def label_clazz(feats: pd.DataFrame) -> pd.Series:
 def add_order_features(feats: pd.DataFrame) -> pd.DataFrame:
     out = feats.copy()
     # liquidity topology proxies: profile via rolling var of returns and distance from ema anchors
-    out['profile_var'] = feats['ret'].rolling(200).var().fillna(method='bfill').fillna(0)
+    out['profile_var'] = _rolling_var(feats['ret'], 200).bfill().fillna(0)
     out['dist_avwap'] = (feats['close'] - feats['ema_slow']) / (feats['rv'] + 1e-9)
     return out
 
@@ -135,7 +272,7 @@ def add_order_features(feats: pd.DataFrame) -> pd.DataFrame:
 def label_order(feats: pd.DataFrame) -> pd.Series:
     # Identify potential wells/barriers via low/high profile_var
     pv = feats['profile_var']
-    p = pv.rank(pct=True)
+    p = _rank_pct(pv)
     lab = pd.Series(index=feats.index, dtype=object)
     lab[p < 0.2] = 'well'
     lab[p > 0.8] = 'barrier'
@@ -146,10 +283,11 @@ def label_order(feats: pd.DataFrame) -> pd.Series:
 def add_family_features(feats: pd.DataFrame) -> pd.DataFrame:
     out = feats.copy()
     # microstructure proxies
-    out['impulse'] = feats['ret'].rolling(5).sum().abs() / (feats['rv'] + 1e-9)
-    out['exhaustion'] = (feats['ret'].rolling(20).sum().abs() / (feats['rv'] + 1e-9)) * (feats['ret'].rolling(20).std())
+    ret20_sum, ret20_var = _rolling(feats['ret'], 20)
+    out['impulse'] = _rolling_sum(feats['ret'], 5).abs() / (feats['rv'] + 1e-9)
+    out['exhaustion'] = (ret20_sum.abs() / (feats['rv'] + 1e-9)) * np.sqrt(ret20_var)
     out['progress_sigma'] = (feats['close'].diff().abs()) / (feats['rv'] + 1e-9)
-    out['vol_mult'] = feats['ret'].abs() / (feats['ret'].abs().rolling(50).mean() + 1e-9)
+    out['vol_mult'] = feats['ret'].abs() / (_rolling_mean(feats['ret'].abs(), 50) + 1e-9)
     return out
 
 
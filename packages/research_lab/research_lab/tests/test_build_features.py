@@ -0,0 +1,24 @@
+import numpy as np
+import pandas as pd
+import pytest
+from research_lab.features import build_features
+
+
+def _nan_walk() -> pd.Series:
+    rng = np.random.default_rng(0)
+    x = 100 + np.cumsum(rng.normal(0, 1, 500))
+    x[:3] = np.nan
+    x[200] = np.nan
+    x[300:305] = np.nan
+    return pd.Series(x)
+
+
+def test_kernels_match_pandas_on_nan_closes(monkeypatch):
+    pytest.importorskip("numba")
+    s = _nan_walk()
+    ema_nb, rsi_nb = build_features.ema(s, 20), build_features.rsi(s, 14)
+    monkeypatch.setattr(build_features, "njit", None)
+    ema_pd, rsi_pd = build_features.ema(s, 20), build_features.rsi(s, 14)
+    np.testing.assert_allclose(ema_nb, ema_pd, rtol=1e-12, equal_nan=True)
+    np.testing.assert_allclose(rsi_nb, rsi_pd, rtol=1e-9, equal_nan=True)
+    assert np.isfinite(rsi_nb.iloc[-1]) and np.isfinite(ema_nb.iloc[-1])
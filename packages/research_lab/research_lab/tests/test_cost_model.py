@@ -0,0 +1,14 @@
+import pandas as pd
+from research_lab.backtest.cost_model import apply_costs, per_bar_cost
+
+def test_apply_costs_flat_per_bar():
+    returns = pd.Series([0.01, -0.02, 0.0])
+    out = apply_costs(returns, fee_bps=5.0, slippage_bps=5.0)
+    assert per_bar_cost(5.0, 5.0) == 0.001
+    pd.testing.assert_series_equal(out, returns - 0.001)
+
+def test_apply_costs_only_on_signal_change():
+    returns = pd.Series([0.01, 0.02, -0.01, 0.03])
+    signal = pd.Series([0, 1, 1, 0])
+    out = apply_costs(returns, fee_bps=5.0, slippage_bps=5.0, signal_change=signal.diff().fillna(0))
+    pd.testing.assert_series_equal(out, pd.Series([0.01, 0.019, -0.01, 0.029]))
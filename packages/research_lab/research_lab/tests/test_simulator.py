@@ -0,0 +1,39 @@
+from research_lab.backtest.simulator import SimConfig, SimOrder, simulate_paper
+
+OHLC = [{'ts': i, 'close': 100.0 + i} for i in range(5)]
+
+def _by_id(res):
+    return {o['order'].client_id: o for o in res['orders']}
+
+def test_reduce_only_rejected_against_same_tick_position():
+    orders = [
+        SimOrder('open', 'buy', 'market', 1.0),
+        SimOrder('add', 'buy', 'market', 1.0, reduce_only=True),
+        SimOrder('close', 'sell', 'market', 0.5, reduce_only=True),
+    ]
+    res = simulate_paper(OHLC[:1], orders, SimConfig(partial_fill_prob=0.0))
+    orders = _by_id(res)
+    assert orders['add']['status'] == 'rejected'
+    assert orders['add']['reason'] == 'reduce_only_violation'
+    assert orders['close']['status'] == 'filled'
+    assert res['account']['base_pos'] == 0.5
+
+def test_post_only_rejects_crossing_limit():
+    orders = [
+        SimOrder('cross', 'buy', 'limit', 1.0, price=150.0),
+        SimOrder('rest', 'buy', 'limit', 1.0, price=50.0),
+    ]
+    res = simulate_paper(OHLC, orders, SimConfig(post_only=True, partial_fill_prob=0.0))
+    orders = _by_id(res)
+    assert orders['cross']['status'] == 'rejected'
+    assert orders['cross']['reason'] == 'post_only_cross'
+    assert orders['rest']['status'] == 'open'
+    assert res['account']['base_pos'] == 0.0
+
+def test_partial_fills_reproducible_with_seed():
+    orders = [SimOrder(f'o{i}', 'buy', 'market', 1.0) for i in range(20)]
+    cfg = SimConfig(partial_fill_prob=0.5, seed=7)
+    a, b = simulate_paper(OHLC, orders, cfg), simulate_paper(OHLC, orders, cfg)
+    assert any(o['status'] == 'partially_filled' or len(o['fills']) > 1 for o in a['orders'])
+    assert a['orders'] == b['orders']
+    assert a['account'] == b['account']
@@ -1,4 +1,7 @@
+import math
 import pandas as pd
+import pytest
+from research_lab.backtest.engine import compute_strategy_columns
 from research_lab.backtest.walkforward import walkforward
 
 def test_walkforward_runs():
@@ -6,3 +9,14 @@ def test_walkforward_runs():
     res = walkforward(df, n_splits=2)
     assert isinstance(res, list)
     assert len(res) == 2
+
+def test_walkforward_folds_match_strategy_columns():
+    df = pd.DataFrame({'close': [100 + 5*math.sin(i/7) + i*0.05 for i in range(250)]})
+    data = compute_strategy_columns(df)
+    equity = data['equity'].to_numpy()
+    strat_ret = data['strat_ret'].to_numpy()
+    split = len(df) // 4
+    for i, fold in enumerate(walkforward(df, n_splits=3)):
+        start, end = (i+1)*split, min((i+2)*split, len(df))
+        assert fold['final_equity'] == pytest.approx(equity[end-1] / equity[start-1])
+        assert fold['avg_ret'] == pytest.approx(strat_ret[start:end].mean())
@@ -0,0 +1,124 @@
+"""
+Tests for Market Data storage
+"""
+import sqlite3
+
+import pytest
+
+from market_data.main import BinanceWebSocketClient
+
+
+@pytest.fixture
+def client(tmp_path):
+    c = BinanceWebSocketClient(["BTCUSDT"], str(tmp_path / "market.db"), str(tmp_path / "parquet"))
+    yield c
+    c.close()
+
+
+def test_save_trades_to_sqlite(client):
+    """Test that a batch of trades is written in one transaction"""
+    trades = [
+        {'timestamp': 1700000000000 + i, 'symbol': 'BTCUSDT', 'price': 100.0 + i,
+         'quantity': 0.5, 'is_buyer_maker': i % 2}
+        for i in range(10)
+    ]
+    client.save_to_sqlite('trades', trades)
+
+    conn = sqlite3.connect(client.db_path)
+    rows = conn.execute("SELECT price FROM trades ORDER BY timestamp").fetchall()
+    conn.close()
+    assert [r[0] for r in rows] == [100.0 + i for i in range(10)]
+
+
+def test_sqlite_uses_wal(client):
+    """Test that the writer connection runs in WAL mode"""
+    mode = client._writer_conn.execute("PRAGMA journal_mode").fetchone()[0]
+    assert mode == "wal"
+
+
+def test_full_trade_buffer_is_persisted_by_writer(tmp_path):
+    """Test that a full trade buffer is flushed by the writer thread"""
+    import asyncio
+
+    client = BinanceWebSocketClient(["BTCUSDT"], str(tmp_path / "market.db"), str(tmp_path / "parquet"))
+
+    async def feed():
+        for i in range(client.buffer_size):
+            await client.handle_trade({'T': 1700000000000 + i, 's': 'BTCUSDT', 'p': '100.5', 'q': '0.1', 'm': False})
+
+    asyncio.run(feed())
+    assert client.trades_n == 0
+    client.close()
+
+    conn = sqlite3.connect(str(tmp_path / "market.db"))
+    count = conn.execute("SELECT COUNT(*) FROM trades").fetchone()[0]
+    conn.close()
+    assert count == client.buffer_size
+
+
+def test_save_to_parquet_appends_new_files(client):
+    """Test that each flush appends a file instead of rewriting the day's data"""
+    import pyarrow.parquet as pq
+
+    trades = [
+        {'timestamp': 1700000000000, 'symbol': 'BTCUSDT', 'price': 100.0,
+         'quantity': 0.5, 'is_buyer_maker': 0}
+    ]
+    client.save_to_parquet('trades', trades)
+    client.save_to_parquet('trades', trades)
+
+    day_dir = client.parquet_dir / 'trades' / 'date=2023-11-14'
+    assert len(list(day_dir.glob('*.parquet'))) == 2
+    assert pq.read_table(client.parquet_dir / 'trades').num_rows == 2
+
+
+def test_depth_levels_stored_as_msgpack(client):
+    """Test that depth levels round-trip through msgpack BLOBs"""
+    import msgpack
+
+    bids = [['100.0', '1.5'], ['99.5', '2.0']]
+    asks = [['100.5', '0.7']]
+    client.save_to_sqlite('depth', [{'timestamp': 1700000000000, 'symbol': 'BTCUSDT', 'bids': bids, 'asks': asks}])
+
+    row = client._writer_conn.execute("SELECT bids, asks FROM depth").fetchone()
+    assert msgpack.unpackb(row[0], raw=False) == bids
+    assert msgpack.unpackb(row[1], raw=False) == asks
+
+
+def test_save_to_parquet_splits_batches_across_days(client):
+    """Test that a batch spanning midnight lands in one partition per day"""
+    import pyarrow.parquet as pq
+
+    trades = [
+        {'timestamp': 1700006399000, 'symbol': 'BTCUSDT', 'price': 100.0, 'quantity': 0.5, 'is_buyer_maker': 0},
+        {'timestamp': 1700006401000, 'symbol': 'BTCUSDT', 'price': 101.0, 'quantity': 0.5, 'is_buyer_maker': 1},
+    ]
+    client.save_to_parquet('trades', trades)
+
+    root = client.parquet_dir / 'trades'
+    assert sorted(p.name for p in root.iterdir()) == ['date=2023-11-14', 'date=2023-11-15']
+    assert pq.read_table(root).num_rows == 2
+
+
+def test_close_flushes_partial_buffers(tmp_path):
+    """Test that rows below the size trigger are persisted on close"""
+    import asyncio
+
+    client = BinanceWebSocketClient(["BTCUSDT"], str(tmp_path / "market.db"), str(tmp_path / "parquet"))
+    asyncio.run(client.handle_trade({'T': 1700000000000, 's': 'BTCUSDT', 'p': '100.5', 'q': '0.1', 'm': True}))
+    assert client.trades_n == 1
+    client.close()
+
+    conn = sqlite3.connect(str(tmp_path / "market.db"))
+    count = conn.execute("SELECT COUNT(*) FROM trades").fetchone()[0]
+    conn.close()
+    assert count == 1
+
+
+def test_dispatch_routes_by_stream_name(client):
+    """Combined-stream names route to their handler; unknown streams are ignored"""
+    import asyncio
+    asyncio.run(client.dispatch('btcusdt@trade', {'T': 1700000000000, 's': 'BTCUSDT', 'p': '1', 'q': '1', 'm': False}))
+    asyncio.run(client.dispatch('btcusdt@bookTicker', {}))
+    assert client.trades_n == 1
+    assert set(client.stream_names()) == set(client._routes)